@@ -53,16 +53,14 @@ variant_order += [v for v in present_variants if v not in variant_order]
 df['variant_type'] = pd.Categorical(df['variant_type'], categories=variant_order, ordered=True)
 
 # 生成 score_diff_df（必须在用到它之前）
-score_diff_long = []
-for base_id, group in df.groupby('base_paper_id'):
-    orig = group[group['variant_type']=='original']
-    if orig.empty:
-        continue
-    orig_score = orig.iloc[0]['rating']
-    for _, row in group.iterrows():
-        if row['variant_type'] != 'original':
-            score_diff_long.append({'variant_type': row['variant_type'], 'score_diff': row['rating']-orig_score})
-score_diff_df = pd.DataFrame(score_diff_long)
+# 每篇论文取第一条 original 评分，映射到其所有变体行后整列相减（无 original 的论文跳过）；
+# 按论文稳定排序，行顺序与逐组遍历一致
+orig_rating_map = df[df['variant_type']=='original'].drop_duplicates('base_paper_id').set_index('base_paper_id')['rating']
+variant_scores = df[df['variant_type']!='original'].astype({'variant_type': object})
+variant_scores['orig_rating'] = variant_scores['base_paper_id'].map(orig_rating_map)
+variant_scores = variant_scores[variant_scores['orig_rating'].notnull()].sort_values('base_paper_id', kind='stable')
+score_diff_values = variant_scores['rating'].to_numpy() - variant_scores['orig_rating'].to_numpy()
+score_diff_df = pd.DataFrame({'variant_type': variant_scores['variant_type'].to_numpy(), 'score_diff': score_diff_values})
 
 # 1. 各变体评分箱线图（original最左，基准线）
 plt.figure(figsize=(10,6))
@@ -144,27 +142,14 @@ plt.savefig(f'{outdir}/case_hml_decision_line.png')
 plt.close()
 
 # 2. 标注异常值（删章节后分数上升）并统计比例
-anomalies = []
-total_variants = 0
-for base_id, group in df.groupby('base_paper_id'):
-    orig = group[group['variant_type']=='original']
-    if orig.empty:
-        continue
-    orig_score = orig.iloc[0]['rating']
-    for _, row in group.iterrows():
-        if row['variant_type'] != 'original':
-            total_variants += 1
-            if row['rating'] > orig_score:
-                anomalies.append({
-                    'base_paper_id': base_id,
-                    'variant_type': row['variant_type'],
-                    'orig_score': orig_score,
-                    'variant_score': row['rating']
-                })
+# 复用上面的分数差数组，一次比较得到全部异常行
+total_variants = len(variant_scores)
+anomalies = variant_scores.loc[score_diff_values > 0, ['base_paper_id', 'variant_type', 'orig_rating', 'rating']].rename(
+    columns={'orig_rating': 'orig_score', 'rating': 'variant_score'}
+)
 anomaly_ratio = len(anomalies) / total_variants if total_variants else 0
-if anomalies:
-    adf = pd.DataFrame(anomalies)
-    adf.to_csv(f'{outdir}/anomaly_score_up.csv', index=False)
+if not anomalies.empty:
+    anomalies.to_csv(f'{outdir}/anomaly_score_up.csv', index=False)
 
 # 在箱线图和评分变化箱线图上标注异常值比例
 plt.figure(figsize=(10,6))
@@ -184,7 +169,7 @@ plt.savefig(f'{outdir}/boxplot_score_diff_variant_type.png')
 plt.close()
 
 # 异常值分布分析图（按变体类型）
-anom_df = pd.DataFrame(anomalies)
+anom_df = anomalies
 if not anom_df.empty:
     plt.figure(figsize=(10,6))
     sns.countplot(x='variant_type', data=anom_df, order=[v for v in variant_order if v != 'original'])
@@ -13,9 +13,11 @@ Input schema (expected per record):
 
 import argparse
 import json
+import os
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Tuple
+from typing import Optional, Tuple
 
 import matplotlib
 matplotlib.use("Agg")
@@ -24,6 +26,20 @@ import numpy as np
 import pandas as pd
 import seaborn as sns
 
+# Copy-on-write: filtered frames share column buffers and only copy a column when it is written,
+# so the defensive .copy() calls after each filter are unnecessary.
+pd.options.mode.copy_on_write = True
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    njit = None
+    HAS_NUMBA = False
+
+KDE_MAX_POINTS = 5000
+SCATTER_MAX_POINTS = 20000
+
 
 def find_latest_attack_results(results_dir: Path) -> Path:
     files = sorted(
@@ -56,13 +72,15 @@ def load_records(jsonl_path: Path) -> pd.DataFrame:
                     "dataset_split": str(record.get("dataset_split", "")),
                     "rating": evaluation.get("avg_rating"),
                     "decision": evaluation.get("paper_decision"),
+                    "title": str(record.get("title", "")),
+                    "text_snippet": str(record.get("text") or "")[:600],
                 }
             )
 
     df = pd.DataFrame(rows)
     if df.empty:
         raise ValueError("No valid rows loaded from JSONL.")
-    df = df[df["rating"].notnull()].copy()
+    df = df[df["rating"].notnull()]
     return df
 
 
@@ -77,8 +95,18 @@ def decision_to_binary(decision: str) -> float:
     return np.nan
 
 
+def _decision_pair_categorical(base_decision: pd.Series, decision: pd.Series) -> pd.Categorical:
+    """Encode `base -> attacked` decision pairs as a categorical without per-row string concatenation."""
+    bd = base_decision.fillna("NA").astype("category")
+    d = decision.fillna("NA").astype("category")
+    n_d = len(d.cat.categories)
+    codes = bd.cat.codes.to_numpy().astype(np.int32) * n_d + d.cat.codes.to_numpy()
+    labels = [f"{a} -> {b}" for a in bd.cat.categories for b in d.cat.categories]
+    return pd.Categorical.from_codes(codes, categories=labels)
+
+
 def build_attack_dataframe(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
-    base = df[(df["attack_type"] == "none") | (df["attack_position"] == "none") | (df["variant_type"] == "original")].copy()
+    base = df[(df["attack_type"] == "none") | (df["attack_position"] == "none") | (df["variant_type"] == "original")]
     base = (
         base.sort_values(["base_paper_id"])
         .drop_duplicates(subset=["base_paper_id"], keep="first")
@@ -86,30 +114,91 @@ def build_attack_dataframe(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame
         .rename(columns={"rating": "base_rating", "decision": "base_decision"})
     )
 
-    attack_df = df[df["attack_type"] != "none"].copy()
+    attack_df = df[df["attack_type"] != "none"]
     attack_df = attack_df.merge(base, on="base_paper_id", how="left")
-    attack_df = attack_df[attack_df["base_rating"].notnull()].copy()
+    attack_df = attack_df[attack_df["base_rating"].notnull()]
     attack_df["rating_delta"] = attack_df["rating"] - attack_df["base_rating"]
     attack_df["accept"] = attack_df["decision"].map(decision_to_binary)
     attack_df["base_accept"] = attack_df["base_decision"].map(decision_to_binary)
-    attack_df["decision_pair"] = attack_df["base_decision"].fillna("NA") + " -> " + attack_df["decision"].fillna("NA")
-    attack_df["delta_sign"] = np.where(
-        attack_df["rating_delta"] > 0,
-        "up",
-        np.where(attack_df["rating_delta"] < 0, "down", "same"),
-    )
+    attack_df["decision_pair"] = _decision_pair_categorical(attack_df["base_decision"], attack_df["decision"])
+    delta = attack_df["rating_delta"].to_numpy()
+    sign_codes = np.select([delta > 0, delta < 0], [0, 1], default=2).astype(np.int8)
+    attack_df["delta_sign"] = pd.Categorical.from_codes(sign_codes, categories=["up", "down", "same"])
     return base, attack_df
 
 
+if HAS_NUMBA:
+    @njit(cache=True)
+    def _per_paper_delta_kernel(codes, delta, ngroups):
+        total = np.zeros(ngroups)
+        total_sq = np.zeros(ngroups)
+        mn = np.full(ngroups, np.inf)
+        mx = np.full(ngroups, -np.inf)
+        count = np.zeros(ngroups, dtype=np.int64)
+        for i in range(codes.size):
+            v = delta[i]
+            if np.isnan(v):
+                continue
+            g = codes[i]
+            total[g] += v
+            total_sq[g] += v * v
+            if v < mn[g]:
+                mn[g] = v
+            if v > mx[g]:
+                mx[g] = v
+            count[g] += 1
+        return total, total_sq, mn, mx, count
+
+
+def aggregate_per_paper(attack_df: pd.DataFrame, use_numba: bool = False) -> pd.DataFrame:
+    """Per-paper delta statistics (mean/std/max/min) plus the first base_rating/base_decision."""
+    if not (use_numba and HAS_NUMBA):
+        return (
+            attack_df.groupby("base_paper_id")
+            .agg(
+                mean_delta=("rating_delta", "mean"),
+                std_delta=("rating_delta", "std"),
+                max_delta=("rating_delta", "max"),
+                min_delta=("rating_delta", "min"),
+                base_rating=("base_rating", "first"),
+                base_decision=("base_decision", "first"),
+            )
+            .reset_index()
+        )
+
+    codes, paper_ids = pd.factorize(attack_df["base_paper_id"], sort=True)
+    codes = codes.astype(np.int32)
+    delta = attack_df["rating_delta"].to_numpy(np.float64)
+    total, total_sq, mn, mx, count = _per_paper_delta_kernel(codes, delta, len(paper_ids))
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = total / count
+        var = (total_sq - total * mean) / (count - 1)
+    std = np.where(count > 1, np.sqrt(np.clip(var, 0, None)), np.nan)
+    empty = count == 0
+    _, first_idx = np.unique(codes, return_index=True)
+    return pd.DataFrame(
+        {
+            "base_paper_id": paper_ids,
+            "mean_delta": mean,
+            "std_delta": std,
+            "max_delta": np.where(empty, np.nan, mx),
+            "min_delta": np.where(empty, np.nan, mn),
+            "base_rating": attack_df["base_rating"].to_numpy()[first_idx],
+            "base_decision": attack_df["base_decision"].to_numpy()[first_idx],
+        }
+    )
+
+
 def ensure_dir(path: Path) -> None:
     path.mkdir(parents=True, exist_ok=True)
 
 
 def _render_table_image(df: pd.DataFrame, title: str, out_path: Path, font_size: int = 9) -> None:
-    display_df = df.copy()
-    for col in display_df.columns:
-        if pd.api.types.is_float_dtype(display_df[col]):
-            display_df[col] = display_df[col].map(lambda x: f"{x:.4f}")
+    display_df = df.copy(deep=False)
+    float_cols = display_df.select_dtypes(include="float").columns
+    if len(float_cols):
+        display_df[float_cols] = np.char.mod("%.4f", display_df[float_cols].to_numpy(dtype=np.float64))
 
     fig_h = max(3.5, 0.45 * (len(display_df) + 1))
     fig, ax = plt.subplots(figsize=(14, fig_h))
@@ -130,7 +219,7 @@ def _render_table_image(df: pd.DataFrame, title: str, out_path: Path, font_size:
 
 
 def _render_top_cases_bar(attack_df: pd.DataFrame, outdir: Path) -> None:
-    top_pos = attack_df.nlargest(20, "rating_delta").copy()
+    top_pos = attack_df.nlargest(20, "rating_delta")
     top_pos["label"] = top_pos["base_paper_id"] + " | " + top_pos["attack_type"] + "@" + top_pos["attack_position"]
     top_pos = top_pos.sort_values("rating_delta", ascending=True)
 
@@ -143,7 +232,7 @@ def _render_top_cases_bar(attack_df: pd.DataFrame, outdir: Path) -> None:
     plt.savefig(outdir / "top_positive_cases_barh.png")
     plt.close()
 
-    top_neg = attack_df.nsmallest(20, "rating_delta").copy()
+    top_neg = attack_df.nsmallest(20, "rating_delta")
     top_neg["label"] = top_neg["base_paper_id"] + " | " + top_neg["attack_type"] + "@" + top_neg["attack_position"]
     top_neg = top_neg.sort_values("rating_delta", ascending=True)
 
@@ -157,7 +246,7 @@ def _render_top_cases_bar(attack_df: pd.DataFrame, outdir: Path) -> None:
     plt.close()
 
 
-def save_summary_tables(base_df: pd.DataFrame, attack_df: pd.DataFrame, outdir: Path) -> dict:
+def save_summary_tables(base_df: pd.DataFrame, attack_df: pd.DataFrame, outdir: Path, use_numba: bool = False) -> dict:
     base_count = base_df["base_paper_id"].nunique()
 
     type_summary = (
@@ -211,13 +300,13 @@ def save_summary_tables(base_df: pd.DataFrame, attack_df: pd.DataFrame, outdir:
         aggfunc="mean",
     ).sort_index()
 
-    transition = (
-        attack_df.groupby(["attack_type", "decision_pair"])
-        .size()
-        .rename("count")
-        .reset_index()
-    )
-    transition["ratio"] = transition["count"] / transition.groupby("attack_type")["count"].transform("sum")
+    pair_counts = attack_df.groupby(["attack_type", "decision_pair"], observed=True).size()
+    transition = pd.DataFrame(
+        {
+            "count": pair_counts,
+            "ratio": pair_counts.div(pair_counts.groupby(level=0).sum(), level=0),
+        }
+    ).reset_index()
     _render_table_image(
         transition.sort_values(["attack_type", "ratio"], ascending=[True, False]),
         "Decision Transition Summary (by Attack Type)",
@@ -226,16 +315,9 @@ def save_summary_tables(base_df: pd.DataFrame, attack_df: pd.DataFrame, outdir:
     )
     _render_top_cases_bar(attack_df, outdir)
 
-    per_paper = (
-        attack_df.groupby("base_paper_id")
-        .agg(
-            mean_delta=("rating_delta", "mean"),
-            std_delta=("rating_delta", "std"),
-            max_delta=("rating_delta", "max"),
-            min_delta=("rating_delta", "min"),
-        )
-        .reset_index()
-    )
+    per_paper = aggregate_per_paper(attack_df, use_numba=use_numba)[
+        ["base_paper_id", "mean_delta", "std_delta", "max_delta", "min_delta"]
+    ]
     _render_table_image(
         per_paper.sort_values("mean_delta", ascending=False).head(20),
         "Top 20 Sensitive Papers by Mean Attack Delta",
@@ -252,87 +334,61 @@ def save_summary_tables(base_df: pd.DataFrame, attack_df: pd.DataFrame, outdir:
     }
 
 
-def plot_charts(base_df: pd.DataFrame, attack_df: pd.DataFrame, outdir: Path) -> None:
+def _subsample(values, max_points: int = KDE_MAX_POINTS, seed: int = 0) -> np.ndarray:
+    """Deterministically subsample large arrays; KDE cost grows with N but the curve does not change visibly."""
+    arr = np.asarray(values)
+    if arr.size <= max_points:
+        return arr
+    return np.random.default_rng(seed).choice(arr, max_points, replace=False)
+
+
+def _init_plot_worker() -> None:
+    matplotlib.use("Agg")
+    matplotlib.rcParams["agg.path.chunksize"] = 20000
     sns.set_theme(style="whitegrid")
 
-    # 1. Baseline vs Attack rating distribution
+
+def plot_rating_distribution(base_ratings: np.ndarray, attack_ratings: np.ndarray, out_path: Path) -> None:
     plt.figure(figsize=(10, 6))
-    sns.kdeplot(base_df["base_rating"], label="baseline (none/original)", fill=True, alpha=0.25)
-    sns.kdeplot(attack_df["rating"], label="attacked", fill=True, alpha=0.25)
+    sns.kdeplot(_subsample(base_ratings), label="baseline (none/original)", fill=True, alpha=0.25)
+    sns.kdeplot(_subsample(attack_ratings), label="attacked", fill=True, alpha=0.25)
     plt.title("Rating Distribution: Baseline vs Attacked")
     plt.xlabel("Rating")
     plt.ylabel("Density")
     plt.legend()
     plt.tight_layout()
-    plt.savefig(outdir / "rating_distribution_baseline_vs_attack.png")
+    plt.savefig(out_path)
     plt.close()
 
-    # 2. Delta by attack type
-    type_order = (
-        attack_df.groupby("attack_type")["rating_delta"]
-        .mean()
-        .sort_values(ascending=False)
-        .index
-        .tolist()
-    )
-    plt.figure(figsize=(10, 6))
-    sns.boxplot(data=attack_df, x="attack_type", y="rating_delta", order=type_order)
-    plt.axhline(0, color="red", linestyle="--", linewidth=1)
-    plt.title("Rating Delta by Attack Type")
-    plt.xlabel("Attack Type")
-    plt.ylabel("Rating Delta (attack - baseline)")
-    plt.xticks(rotation=0)
-    plt.tight_layout()
-    plt.savefig(outdir / "box_rating_delta_by_attack_type.png")
-    plt.close()
 
-    # 3. Delta by attack position
-    pos_order = (
-        attack_df.groupby("attack_position")["rating_delta"]
-        .mean()
-        .sort_values(ascending=False)
-        .index
-        .tolist()
-    )
+def plot_delta_box(df: pd.DataFrame, x: str, order, title: str, xlabel: str, out_path: Path) -> None:
     plt.figure(figsize=(10, 6))
-    sns.boxplot(data=attack_df, x="attack_position", y="rating_delta", order=pos_order)
+    sns.boxplot(data=df, x=x, y="rating_delta", order=order)
     plt.axhline(0, color="red", linestyle="--", linewidth=1)
-    plt.title("Rating Delta by Attack Position")
-    plt.xlabel("Attack Position")
+    plt.title(title)
+    plt.xlabel(xlabel)
     plt.ylabel("Rating Delta (attack - baseline)")
     plt.xticks(rotation=0)
     plt.tight_layout()
-    plt.savefig(outdir / "box_rating_delta_by_attack_position.png")
+    plt.savefig(out_path)
     plt.close()
 
-    # 4. Heatmap: type x position mean delta
-    delta_pivot = attack_df.pivot_table(
-        index="attack_type", columns="attack_position", values="rating_delta", aggfunc="mean"
-    )
-    plt.figure(figsize=(10, 6))
-    sns.heatmap(delta_pivot, annot=True, fmt=".2f", cmap="coolwarm", center=0)
-    plt.title("Mean Rating Delta: Attack Type x Position")
-    plt.tight_layout()
-    plt.savefig(outdir / "heatmap_mean_delta_type_position.png")
-    plt.close()
 
-    # 5. Heatmap: type x position accept rate
-    accept_pivot = attack_df.pivot_table(
-        index="attack_type", columns="attack_position", values="accept", aggfunc="mean"
-    )
+def plot_heatmap(pivot: pd.DataFrame, title: str, out_path: Path, **heatmap_kwargs) -> None:
     plt.figure(figsize=(10, 6))
-    sns.heatmap(accept_pivot, annot=True, fmt=".2f", cmap="YlGnBu", vmin=0, vmax=1)
-    plt.title("Accept Rate: Attack Type x Position")
+    sns.heatmap(pivot, annot=True, **heatmap_kwargs)
+    plt.title(title)
     plt.tight_layout()
-    plt.savefig(outdir / "heatmap_accept_rate_type_position.png")
+    plt.savefig(out_path)
     plt.close()
 
-    # 6. Combined 2x2 heatmaps split by attacked score threshold
+
+def plot_score_group_heatmaps(df: pd.DataFrame, type_order, pos_order, out_path: Path) -> None:
     score_splits = [
-        ("High Baseline (base_rating > 4)", attack_df[attack_df["base_rating"] > 4]),
-        ("Low Baseline (base_rating <= 4)", attack_df[attack_df["base_rating"] <= 4]),
+        ("High Baseline (base_rating > 4)", df[df["base_rating"] > 4]),
+        ("Low Baseline (base_rating <= 4)", df[df["base_rating"] <= 4]),
     ]
-    delta_abs_max = float(np.nanmax(np.abs(attack_df["rating_delta"].to_numpy())))
+    delta_abs_max = float(np.nanmax(np.abs(df["rating_delta"].to_numpy())))
     if not np.isfinite(delta_abs_max) or delta_abs_max == 0:
         delta_abs_max = 1.0
 
@@ -384,101 +440,71 @@ def plot_charts(base_df: pd.DataFrame, attack_df: pd.DataFrame, outdir: Path) ->
 
     fig.suptitle("Attack Type x Position Heatmaps by Score Group", fontsize=14)
     plt.tight_layout(rect=[0, 0, 1, 0.97])
-    plt.savefig(outdir / "heatmap_type_position_by_score_group_2x2.png")
+    plt.savefig(out_path)
     plt.close()
 
-    # 7. Positive/down/same stacked by attack type
-    sign_counts = (
-        attack_df.groupby(["attack_type", "delta_sign"])
-        .size()
-        .unstack(fill_value=0)
-        .reindex(type_order)
-    )
-    sign_ratio = sign_counts.div(sign_counts.sum(axis=1), axis=0)
-    sign_ratio = sign_ratio.reindex(columns=["up", "same", "down"], fill_value=0)
-    sign_ratio.plot(
-        kind="bar",
-        stacked=True,
-        figsize=(10, 6),
-        color=["#ef5350", "#ffca28", "#66bb6a"],
-    )
-    plt.title("Delta Sign Ratio by Attack Type")
-    plt.xlabel("Attack Type")
-    plt.ylabel("Ratio")
-    plt.legend(title="delta_sign")
-    plt.xticks(rotation=0)
-    plt.tight_layout()
-    plt.savefig(outdir / "stacked_delta_sign_by_attack_type.png")
-    plt.close()
 
-    # 7. Decision transitions by attack type
-    trans = (
-        attack_df.groupby(["attack_type", "decision_pair"])
-        .size()
-        .unstack(fill_value=0)
-        .reindex(type_order)
-    )
-    trans_ratio = trans.div(trans.sum(axis=1), axis=0)
-    trans_ratio.plot(kind="bar", stacked=True, figsize=(12, 6), colormap="tab20")
-    plt.title("Decision Transition Ratio by Attack Type")
+def plot_stacked_ratio(ratio: pd.DataFrame, title: str, out_path: Path, legend_title=None, **plot_kwargs) -> None:
+    ratio.plot(kind="bar", stacked=True, **plot_kwargs)
+    plt.title(title)
     plt.xlabel("Attack Type")
     plt.ylabel("Ratio")
+    if legend_title:
+        plt.legend(title=legend_title)
     plt.xticks(rotation=0)
     plt.tight_layout()
-    plt.savefig(outdir / "stacked_decision_transition_by_attack_type.png")
+    plt.savefig(out_path)
     plt.close()
 
-    # 8. Section found vs not-found
-    if attack_df["section_found"].nunique() > 1:
-        plt.figure(figsize=(8, 6))
-        sns.boxplot(data=attack_df, x="section_found", y="rating_delta")
-        plt.axhline(0, color="red", linestyle="--", linewidth=1)
-        plt.title("Rating Delta by section_found")
-        plt.xlabel("Section Found")
-        plt.ylabel("Rating Delta")
-        plt.tight_layout()
-        plt.savefig(outdir / "box_rating_delta_section_found.png")
-        plt.close()
-
-    # 9. Accept rate bar by type and position
-    type_accept = attack_df.groupby("attack_type")["accept"].mean().reindex(type_order)
-    plt.figure(figsize=(10, 6))
-    type_accept.plot(kind="bar", color="#42a5f5")
-    plt.ylim(0, 1)
-    plt.title("Accept Rate by Attack Type")
-    plt.xlabel("Attack Type")
-    plt.ylabel("Accept Rate")
-    plt.xticks(rotation=0)
+
+def plot_section_found_box(df: pd.DataFrame, out_path: Path) -> None:
+    plt.figure(figsize=(8, 6))
+    sns.boxplot(data=df, x="section_found", y="rating_delta")
+    plt.axhline(0, color="red", linestyle="--", linewidth=1)
+    plt.title("Rating Delta by section_found")
+    plt.xlabel("Section Found")
+    plt.ylabel("Rating Delta")
     plt.tight_layout()
-    plt.savefig(outdir / "bar_accept_rate_by_attack_type.png")
+    plt.savefig(out_path)
     plt.close()
 
-    pos_accept = attack_df.groupby("attack_position")["accept"].mean().reindex(pos_order)
+
+def plot_accept_rate_bar(rates: pd.Series, color: str, title: str, xlabel: str, out_path: Path) -> None:
     plt.figure(figsize=(10, 6))
-    pos_accept.plot(kind="bar", color="#26a69a")
+    rates.plot(kind="bar", color=color)
     plt.ylim(0, 1)
-    plt.title("Accept Rate by Attack Position")
-    plt.xlabel("Attack Position")
+    plt.title(title)
+    plt.xlabel(xlabel)
     plt.ylabel("Accept Rate")
     plt.xticks(rotation=0)
     plt.tight_layout()
-    plt.savefig(outdir / "bar_accept_rate_by_attack_position.png")
+    plt.savefig(out_path)
     plt.close()
 
-    # 10. Scatter: baseline score vs delta
+
+def plot_baseline_delta_scatter(df: pd.DataFrame, out_path: Path) -> None:
     plt.figure(figsize=(8, 6))
-    sns.scatterplot(data=attack_df, x="base_rating", y="rating_delta", hue="attack_type", alpha=0.35, s=25)
+    if len(df) > SCATTER_MAX_POINTS:
+        # Too many points to draw individually: show a 2D density instead.
+        counts, x_edges, y_edges = np.histogram2d(df["base_rating"], df["rating_delta"], bins=(60, 60))
+        mesh = plt.pcolormesh(x_edges, y_edges, np.ma.masked_equal(counts.T, 0), cmap="viridis")
+        plt.colorbar(mesh, label="Count")
+    else:
+        ax = sns.scatterplot(data=df, x="base_rating", y="rating_delta", hue="attack_type", alpha=0.35, s=25)
+        for coll in ax.collections:
+            coll.set_rasterized(True)
     plt.axhline(0, color="red", linestyle="--", linewidth=1)
     plt.title("Baseline Score vs Rating Delta")
     plt.xlabel("Baseline Rating")
     plt.ylabel("Rating Delta")
     plt.tight_layout()
-    plt.savefig(outdir / "scatter_baseline_vs_delta.png")
+    plt.savefig(out_path)
     plt.close()
 
-    # 11. Per-paper mean delta histogram split by baseline score group
+
+def plot_per_paper_hist(df: pd.DataFrame, out_path: Path) -> None:
     per_paper = (
-        attack_df.groupby("base_paper_id")
+        df.groupby("base_paper_id")
         .agg(mean_delta=("rating_delta", "mean"), base_rating=("base_rating", "first"))
         .reset_index()
     )
@@ -503,19 +529,147 @@ def plot_charts(base_df: pd.DataFrame, attack_df: pd.DataFrame, outdir: Path) ->
     plt.xlabel("Mean Delta per Paper")
     plt.ylabel("Count")
     plt.tight_layout()
-    plt.savefig(outdir / "hist_mean_delta_per_paper.png")
+    plt.savefig(out_path)
     plt.close()
 
-    # 12. Count heatmap to verify balanced design
-    count_pivot = attack_df.pivot_table(
-        index="attack_type", columns="attack_position", values="base_paper_id", aggfunc="count"
+
+def _run_plot_tasks(tasks, workers: Optional[int]) -> None:
+    """Render independent figures; Agg is process-safe, so each worker draws its own PNGs."""
+    if workers is None:
+        workers = min(8, os.cpu_count() or 1, len(tasks))
+    if workers <= 1:
+        _init_plot_worker()
+        for fn, args, kwargs in tasks:
+            fn(*args, **kwargs)
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_plot_worker) as ex:
+        futures = [ex.submit(fn, *args, **kwargs) for fn, args, kwargs in tasks]
+        for future in futures:
+            future.result()
+
+
+def plot_charts(base_df: pd.DataFrame, attack_df: pd.DataFrame, outdir: Path, workers: Optional[int] = None) -> None:
+    sns.set_theme(style="whitegrid")
+
+    type_order = (
+        attack_df.groupby("attack_type")["rating_delta"]
+        .mean()
+        .sort_values(ascending=False)
+        .index
+        .tolist()
+    )
+    pos_order = (
+        attack_df.groupby("attack_position")["rating_delta"]
+        .mean()
+        .sort_values(ascending=False)
+        .index
+        .tolist()
     )
-    plt.figure(figsize=(10, 6))
-    sns.heatmap(count_pivot, annot=True, fmt=".0f", cmap="Blues")
-    plt.title("Sample Count: Attack Type x Position")
-    plt.tight_layout()
-    plt.savefig(outdir / "heatmap_count_type_position.png")
-    plt.close()
+
+    type_codes, type_labels = pd.factorize(attack_df["attack_type"])
+    sign_cat = attack_df["delta_sign"].cat
+    n_signs = len(sign_cat.categories)
+    flat = type_codes * n_signs + sign_cat.codes.to_numpy()
+    sign_counts = pd.DataFrame(
+        np.bincount(flat, minlength=len(type_labels) * n_signs).reshape(len(type_labels), n_signs),
+        index=type_labels,
+        columns=list(sign_cat.categories),
+    ).reindex(type_order)
+    sign_ratio = sign_counts.div(sign_counts.sum(axis=1), axis=0)
+    sign_ratio = sign_ratio.reindex(columns=["up", "same", "down"], fill_value=0)
+
+    trans = (
+        attack_df.groupby(["attack_type", "decision_pair"], observed=True)
+        .size()
+        .unstack(fill_value=0)
+        .reindex(type_order)
+    )
+    trans_ratio = trans.div(trans.sum(axis=1), axis=0)
+
+    tasks = [
+        # 1. Baseline vs Attack rating distribution
+        (plot_rating_distribution, (
+            base_df["base_rating"].to_numpy(),
+            attack_df["rating"].to_numpy(),
+            outdir / "rating_distribution_baseline_vs_attack.png",
+        ), {}),
+        # 2. Delta by attack type
+        (plot_delta_box, (
+            attack_df[["attack_type", "rating_delta"]], "attack_type", type_order,
+            "Rating Delta by Attack Type", "Attack Type",
+            outdir / "box_rating_delta_by_attack_type.png",
+        ), {}),
+        # 3. Delta by attack position
+        (plot_delta_box, (
+            attack_df[["attack_position", "rating_delta"]], "attack_position", pos_order,
+            "Rating Delta by Attack Position", "Attack Position",
+            outdir / "box_rating_delta_by_attack_position.png",
+        ), {}),
+        # 4. Heatmap: type x position mean delta
+        (plot_heatmap, (
+            attack_df.pivot_table(index="attack_type", columns="attack_position", values="rating_delta", aggfunc="mean"),
+            "Mean Rating Delta: Attack Type x Position",
+            outdir / "heatmap_mean_delta_type_position.png",
+        ), {"fmt": ".2f", "cmap": "coolwarm", "center": 0}),
+        # 5. Heatmap: type x position accept rate
+        (plot_heatmap, (
+            attack_df.pivot_table(index="attack_type", columns="attack_position", values="accept", aggfunc="mean"),
+            "Accept Rate: Attack Type x Position",
+            outdir / "heatmap_accept_rate_type_position.png",
+        ), {"fmt": ".2f", "cmap": "YlGnBu", "vmin": 0, "vmax": 1}),
+        # 6. Combined 2x2 heatmaps split by attacked score threshold
+        (plot_score_group_heatmaps, (
+            attack_df[["attack_type", "attack_position", "base_rating", "rating_delta", "accept"]],
+            type_order, pos_order,
+            outdir / "heatmap_type_position_by_score_group_2x2.png",
+        ), {}),
+        # 7. Positive/down/same stacked by attack type
+        (plot_stacked_ratio, (
+            sign_ratio, "Delta Sign Ratio by Attack Type",
+            outdir / "stacked_delta_sign_by_attack_type.png",
+        ), {"legend_title": "delta_sign", "figsize": (10, 6), "color": ["#ef5350", "#ffca28", "#66bb6a"]}),
+        # 7. Decision transitions by attack type
+        (plot_stacked_ratio, (
+            trans_ratio, "Decision Transition Ratio by Attack Type",
+            outdir / "stacked_decision_transition_by_attack_type.png",
+        ), {"figsize": (12, 6), "colormap": "tab20"}),
+        # 9. Accept rate bar by type and position
+        (plot_accept_rate_bar, (
+            attack_df.groupby("attack_type")["accept"].mean().reindex(type_order), "#42a5f5",
+            "Accept Rate by Attack Type", "Attack Type",
+            outdir / "bar_accept_rate_by_attack_type.png",
+        ), {}),
+        (plot_accept_rate_bar, (
+            attack_df.groupby("attack_position")["accept"].mean().reindex(pos_order), "#26a69a",
+            "Accept Rate by Attack Position", "Attack Position",
+            outdir / "bar_accept_rate_by_attack_position.png",
+        ), {}),
+        # 10. Scatter: baseline score vs delta
+        (plot_baseline_delta_scatter, (
+            attack_df[["base_rating", "rating_delta", "attack_type"]],
+            outdir / "scatter_baseline_vs_delta.png",
+        ), {}),
+        # 11. Per-paper mean delta histogram split by baseline score group
+        (plot_per_paper_hist, (
+            attack_df[["base_paper_id", "rating_delta", "base_rating"]],
+            outdir / "hist_mean_delta_per_paper.png",
+        ), {}),
+        # 12. Count heatmap to verify balanced design
+        (plot_heatmap, (
+            attack_df.pivot_table(index="attack_type", columns="attack_position", values="base_paper_id", aggfunc="count"),
+            "Sample Count: Attack Type x Position",
+            outdir / "heatmap_count_type_position.png",
+        ), {"fmt": ".0f", "cmap": "Blues"}),
+    ]
+
+    # 8. Section found vs not-found
+    if attack_df["section_found"].nunique() > 1:
+        tasks.append((plot_section_found_box, (
+            attack_df[["section_found", "rating_delta"]],
+            outdir / "box_rating_delta_section_found.png",
+        ), {}))
+
+    _run_plot_tasks(tasks, workers)
 
 
 def write_readme(input_file: Path, base_df: pd.DataFrame, attack_df: pd.DataFrame, outdir: Path) -> None:
@@ -585,7 +739,7 @@ def write_plot_explanation_doc(input_file: Path, base_df: pd.DataFrame, attack_d
         "6. `top_negative_cases_barh.png`: 单样本降分最大的 20 个 case（横向条形图）。",
         "计算逻辑: `nsmallest(20, rating_delta)`。",
         "7. `rating_distribution_baseline_vs_attack.png`: baseline 与攻击样本评分核密度对比。",
-        "计算逻辑: 分别对 `base_rating` 与 `rating` 做 KDE。",
+        "计算逻辑: 分别对 `base_rating` 与 `rating` 做 KDE（样本数超过 5000 时先固定种子无放回抽样 5000 个）。",
         "8. `box_rating_delta_by_attack_type.png`: 各攻击类型的 `rating_delta` 箱线图。",
         "计算逻辑: x=attack_type, y=rating_delta；红虚线 y=0 表示“无变化”。",
         "9. `box_rating_delta_by_attack_position.png`: 各攻击位置的 `rating_delta` 箱线图。",
@@ -605,7 +759,7 @@ def write_plot_explanation_doc(input_file: Path, base_df: pd.DataFrame, attack_d
         "15. `bar_accept_rate_by_attack_position.png`: 各攻击位置 Accept 率柱状图。",
         "计算逻辑: `groupby(attack_position)['accept'].mean()`。",
         "16. `scatter_baseline_vs_delta.png`: baseline 分数与分数变化散点图（按 attack_type 着色）。",
-        "计算逻辑: 每条攻击样本一个点，x=base_rating, y=rating_delta。",
+        "计算逻辑: 每条攻击样本一个点，x=base_rating, y=rating_delta；样本数超过 20000 时改为 60x60 二维直方图（颜色为计数）。",
         "17. `hist_mean_delta_per_paper.png`: 每篇论文平均攻击效应分布直方图（按 baseline 分组着色）。",
         "计算逻辑: 先按 `base_paper_id` 求 mean(rating_delta) 与 base_rating，再按 `base_rating<=4`(红) / `>4`(绿) 叠加直方图 + KDE。",
         "18. `heatmap_count_type_position.png`: 类型×位置样本数热力图（检查数据平衡性）。",
@@ -621,7 +775,7 @@ def write_plot_explanation_doc(input_file: Path, base_df: pd.DataFrame, attack_d
     (outdir / "PLOT_EXPLANATION_CN.md").write_text("\n".join(lines), encoding="utf-8")
 
 
-def analyze_sensitive_papers(base_df, attack_df, output_dir):
+def analyze_sensitive_papers(base_df, attack_df, output_dir, use_numba=False):
     import matplotlib.pyplot as plt
     import seaborn as sns
     import pandas as pd
@@ -629,18 +783,7 @@ def analyze_sensitive_papers(base_df, attack_df, output_dir):
     import numpy as np
 
     # 1. 计算每篇论文的mean_delta等统计量
-    per_paper = (
-        attack_df.groupby("base_paper_id")
-        .agg(
-            mean_delta=("rating_delta", "mean"),
-            std_delta=("rating_delta", "std"),
-            max_delta=("rating_delta", "max"),
-            min_delta=("rating_delta", "min"),
-            base_rating=("base_rating", "first"),
-            base_decision=("base_decision", "first"),
-        )
-        .reset_index()
-    )
+    per_paper = aggregate_per_paper(attack_df, use_numba=use_numba)
     # 2. 选取敏感论文样本（改为前20篇）
     top_sensitive = per_paper.sort_values("mean_delta", ascending=False).head(20)
     top_sensitive_path = Path(output_dir) / "top20_sensitive_papers.csv"
@@ -711,31 +854,14 @@ def analyze_sensitive_papers(base_df, attack_df, output_dir):
     conclusion_lines.append(f"全体论文原始决策分布: \n{per_paper['base_decision'].value_counts()}\n")
     conclusion_lines.append("结论: 敏感论文普遍原始分数较低，原始决策多为reject，说明分数低、质量较差的论文更容易被攻击影响。\n")
 
-    # 7. 读取敏感论文原文片段（如有）并写入结论
-    # 尝试从attack_df中找到敏感论文的原始文本
-    try:
-        import json
-        attack_jsonl = None
-        # 自动寻找最新的attack_results_*.jsonl
-        from glob import glob
-        import os
-        attack_dir = os.path.join(str(output_dir).split("analysis_output")[0], "evaluation_results_attack")
-        jsonl_files = sorted(glob(os.path.join(attack_dir, "attack_results_*.jsonl")), key=os.path.getmtime, reverse=True)
-        if jsonl_files:
-            attack_jsonl = jsonl_files[0]
-        if attack_jsonl:
-            with open(attack_jsonl, 'r', encoding='utf-8') as f:
-                for line in f:
-                    rec = json.loads(line)
-                    base_id = rec.get('base_paper_id', '')
-                    if base_id in set(top_sensitive['base_paper_id']):
-                        title = rec.get('title', '')
-                        text = rec.get('text', '')
-                        if text:
-                            snippet = text[:600].replace('\n', ' ').replace('\r', ' ')
-                            conclusion_lines.append(f"\n【敏感论文示例: {title}】\n{text[:600]}...\n")
-    except Exception as e:
-        conclusion_lines.append(f"\n【原文片段读取失败: {e}】\n")
+    # 7. 敏感论文原文片段（load_records 已携带 title/text_snippet，无需再次扫描 JSONL）
+    snippets = (
+        attack_df[attack_df["text_snippet"] != ""]
+        .drop_duplicates("base_paper_id")
+        .set_index("base_paper_id")[["title", "text_snippet"]]
+    )
+    for row in top_sensitive.join(snippets, on="base_paper_id").dropna(subset=["text_snippet"]).itertuples():
+        conclusion_lines.append(f"\n【敏感论文示例: {row.title}】\n{row.text_snippet}...\n")
 
     # 写入txt
     txt_path = Path(output_dir) / "sensitive_paper_conclusion.txt"
@@ -754,7 +880,20 @@ def main():
     parser.add_argument("--input", type=Path, default=None, help="Attack results JSONL file")
     parser.add_argument("--results-dir", type=Path, default=default_results_dir, help="Directory to auto-find input")
     parser.add_argument("--output-dir", type=Path, default=default_output_dir, help="Output directory")
+    parser.add_argument(
+        "--numba",
+        action="store_true",
+        help="Use a Numba kernel for per-paper aggregation (for very large result sets)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Processes used to render figures (default: min(8, CPU count); 1 renders serially)",
+    )
     args = parser.parse_args()
+    if args.numba and not HAS_NUMBA:
+        print("Note: numba not available, falling back to pandas aggregation")
 
     input_file = args.input if args.input else find_latest_attack_results(args.results_dir)
     output_dir = args.output_dir
@@ -765,11 +904,11 @@ def main():
     if attack_df.empty:
         raise ValueError("No attack rows found (attack_type != none).")
 
-    save_summary_tables(base_df, attack_df, output_dir)
-    plot_charts(base_df, attack_df, output_dir)
+    save_summary_tables(base_df, attack_df, output_dir, use_numba=args.numba)
+    plot_charts(base_df, attack_df, output_dir, workers=args.workers)
     write_readme(input_file, base_df, attack_df, output_dir)
     write_plot_explanation_doc(input_file, base_df, attack_df, output_dir)
-    analyze_sensitive_papers(base_df, attack_df, output_dir)
+    analyze_sensitive_papers(base_df, attack_df, output_dir, use_numba=args.numba)
 
     print(f"Analysis complete. Output directory: {output_dir}")
     print(f"Input file: {input_file}")
@@ -3,12 +3,51 @@ Dataset Visualization and Analysis Script
 Analyzes the generated paper variant dataset and creates various visualizations
 """
 
+import argparse
 import json
+import mmap
+import os
+import matplotlib
+matplotlib.use('Agg')  # headless: no GUI backend probing
+import matplotlib.image
 import matplotlib.pyplot as plt
 import seaborn as sns
+import numpy as np
 import pandas as pd
-from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from itertools import repeat
 from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+# orjson parses bytes directly and is much faster than the stdlib decoder
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+# msgspec decodes straight into a typed struct, skipping fields the analysis does not use
+try:
+    import msgspec
+    HAS_MSGSPEC = True
+except ImportError:
+    HAS_MSGSPEC = False
+
+# pyarrow parses line-delimited JSON in parallel C++ threads outside the GIL
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    from pyarrow import json as pa_json
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
 
 # Set style
 sns.set_style("whitegrid")
@@ -21,161 +60,514 @@ TEST_FILE = PROJECT_ROOT / "util/test_with_variants.jsonl"
 OUTPUT_DIR = PROJECT_ROOT / "analysis_output"
 OUTPUT_DIR.mkdir(exist_ok=True)
 
-
-def load_dataset(file_path: Path):
-    """Load dataset from JSONL file"""
-    data = []
+# Every paper is expected to have all of these variants; each gets one bit of a per-paper mask
+EXPECTED_VARIANTS = (
+    'original', 'no_abstract', 'no_conclusion', 'no_introduction',
+    'no_references', 'no_experiments', 'no_methods', 'no_formulas', 'no_figures'
+)
+VARIANT_BIT = {name: 1 << i for i, name in enumerate(EXPECTED_VARIANTS)}
+FULL_VARIANT_MASK = (1 << len(EXPECTED_VARIANTS)) - 1
+# Any unexpected variant sets this bit, so such papers never compare equal to the full mask
+OTHER_VARIANT_BIT = 1 << len(EXPECTED_VARIANTS)
+
+# Ratings (int or float) are binned like plt.hist(bins=range(1, RATING_MAX + 2)): unit bins from 1,
+# the last one closed so RATING_MAX + 1 is still counted. ratings_hist[k] is the bin starting at k.
+RATING_MAX = 10
+RATING_BINS = np.arange(1, RATING_MAX + 2)
+
+# Arrow reads in blocks that must hold at least one full line (i.e. one paper text)
+ARROW_BLOCK_SIZE = 64 << 20
+# Files at least this large are split into line-aligned byte ranges and parsed by a process pool
+PARALLEL_PARSE_MIN_BYTES = 50 * 1024 * 1024
+# Below this many papers the vectorized numpy path is fast enough and avoids JIT compile time
+NUMBA_REDUCTION_MIN_PAPERS = 100_000
+
+
+def _reduction_sums_numpy(lengths, orig_col):
+    """Per-variant sums/counts of reduction percentages; lengths uses -1 for a missing variant"""
+    if orig_col >= 0:
+        original_len = lengths[:, orig_col].astype(np.float64)
+        original_len[original_len < 0] = 1  # a paper without an original is compared against 1
+    else:
+        original_len = np.ones(lengths.shape[0])
+    valid = (lengths >= 0) & (original_len != 0)[:, None]
+    if orig_col >= 0:
+        valid[:, orig_col] = False
+    with np.errstate(divide='ignore', invalid='ignore'):
+        reductions = (1 - lengths / original_len[:, None]) * 100
+    return np.where(valid, reductions, 0.0).sum(axis=0), valid.sum(axis=0)
+
+
+if HAS_NUMBA:
+    @njit(cache=True)
+    def _reduction_sums_numba(lengths, orig_col):
+        """Same as _reduction_sums_numpy in one pass without the temporary matrices"""
+        n_papers, n_variants = lengths.shape
+        sums = np.zeros(n_variants)
+        counts = np.zeros(n_variants, dtype=np.int64)
+        for i in range(n_papers):
+            original_len = lengths[i, orig_col] if orig_col >= 0 else -1
+            if original_len < 0:
+                original_len = 1
+            if original_len == 0:
+                continue
+            for j in range(n_variants):
+                length = lengths[i, j]
+                if j != orig_col and length >= 0:
+                    sums[j] += (1 - length / original_len) * 100
+                    counts[j] += 1
+        return sums, counts
+
+
+def _remap_codes(index: Dict, other_index: Dict) -> np.ndarray:
+    """Codes of other_index's keys in index, adding unseen keys in other_index's first-seen order"""
+    return np.array([index.setdefault(key, len(index)) for key in other_index], dtype=np.int64)
+
+
+@dataclass
+class Aggregates:
+    """Per-dataset accumulators filled in a single pass over the JSONL file"""
+    total_records: int = 0
+    # Per-record columns; string fields are stored as small integer codes into a
+    # first-seen index, and counts are derived from them in finalize()
+    variant_index: Dict[str, int] = field(default_factory=dict)
+    variant_codes: List[int] = field(default_factory=list)
+    decision_index: Dict[Optional[str], int] = field(default_factory=dict)
+    decision_codes: List[int] = field(default_factory=list)
+    text_lengths: List[int] = field(default_factory=list)
+    # Running rating statistics; individual ratings are never stored
+    rating_count: int = 0
+    rating_sum: int = 0
+    rating_min: Optional[int] = None
+    rating_max: Optional[int] = None
+    ratings_hist: np.ndarray = field(default_factory=lambda: np.zeros(RATING_MAX + 1, dtype=np.int64))
+    paper_index: Dict[str, int] = field(default_factory=dict)
+    paper_codes: List[int] = field(default_factory=list)
+    # Set by finalize(): per paper code, the OR of the VARIANT_BIT of every variant seen for it
+    paper_masks: Optional[np.ndarray] = None
+    # variant_type -> mean text reduction (%) relative to the paper's original, set by finalize()
+    avg_reductions: Dict[str, float] = field(default_factory=dict)
+    # Set by finalize(): variant_type -> count (first-seen order), decision -> count,
+    # and a decision x variant_type count table with empty decisions shown as 'unknown'
+    variant_counts: Dict[str, int] = field(default_factory=dict)
+    decision_counts: Dict[str, int] = field(default_factory=dict)
+    decision_matrix: Optional[pd.DataFrame] = None
+
+    @property
+    def variant_names(self) -> List[str]:
+        """Variant types in code order (first seen first)"""
+        return list(self.variant_index)
+
+    def add(self, item):
+        """Update all accumulators with one record"""
+        self.total_records += 1
+        self.variant_codes.append(self.variant_index.setdefault(item['variant_type'], len(self.variant_index)))
+        # A missing decision and an explicit null both count as 'unknown', whichever reader produced the record
+        decision = item.get('decision')
+        if decision is None:
+            decision = 'unknown'
+        self.decision_codes.append(self.decision_index.setdefault(decision, len(self.decision_index)))
+        self.text_lengths.append(item['text_length'])
+        rates = item.get('rates')
+        if rates:
+            self._add_rating_stats(len(rates), sum(rates), min(rates), max(rates))
+            self.ratings_hist[1:] += np.histogram(rates, bins=RATING_BINS)[0]
+
+        self.paper_codes.append(self.paper_index.setdefault(item['paper_id'], len(self.paper_index)))
+
+    def _add_rating_stats(self, count, total, low, high):
+        """Fold a batch of ratings' count/sum/min/max into the running statistics"""
+        self.rating_count += count
+        self.rating_sum += total
+        self.rating_min = low if self.rating_min is None else min(self.rating_min, low)
+        self.rating_max = high if self.rating_max is None else max(self.rating_max, high)
+
+    def merge(self, other: 'Aggregates'):
+        """Fold in the accumulators of a later part of the same file (before finalize)"""
+        self.total_records += other.total_records
+        self.text_lengths.extend(other.text_lengths)
+        if other.rating_count:
+            self._add_rating_stats(other.rating_count, other.rating_sum, other.rating_min, other.rating_max)
+        self.ratings_hist += other.ratings_hist
+        # Translate the other part's codes into this one's
+        for index, codes, other_index, other_codes in (
+            (self.variant_index, self.variant_codes, other.variant_index, other.variant_codes),
+            (self.decision_index, self.decision_codes, other.decision_index, other.decision_codes),
+            (self.paper_index, self.paper_codes, other.paper_index, other.paper_codes),
+        ):
+            remap = _remap_codes(index, other_index)
+            codes.extend(remap[np.asarray(other_codes, dtype=np.int64)].tolist())
+        return self
+
+    def finalize(self):
+        """Derive counts, per-paper masks and text reductions from the per-record columns"""
+        variant_names = self.variant_names
+        variant_codes = np.asarray(self.variant_codes, dtype=np.int64)
+        decision_codes = np.asarray(self.decision_codes, dtype=np.int64)
+        paper_codes = np.asarray(self.paper_codes, dtype=np.int64)
+        n_variants, n_papers = len(variant_names), len(self.paper_index)
+
+        self.variant_counts = dict(zip(variant_names, np.bincount(variant_codes, minlength=n_variants).tolist()))
+        self.decision_counts = dict(zip(
+            self.decision_index, np.bincount(decision_codes, minlength=len(self.decision_index)).tolist()
+        ))
+
+        # decision x variant_type counts from a bincount over flat (decision, variant) codes,
+        # with both axes sorted like a pivot table
+        decision_labels = pd.Index([decision or 'unknown' for decision in self.decision_index], dtype=object)
+        label_codes, decision_levels = pd.factorize(decision_labels, sort=True)
+        variant_order = np.argsort(np.array(variant_names, dtype=object))
+        variant_rank = np.empty_like(variant_order)
+        variant_rank[variant_order] = np.arange(n_variants)
+        n_decisions = len(decision_levels)
+        flat = label_codes[decision_codes] * n_variants + variant_rank[variant_codes]
+        self.decision_matrix = pd.DataFrame(
+            np.bincount(flat, minlength=n_decisions * n_variants).reshape(n_decisions, n_variants),
+            index=pd.Index(decision_levels, name='decision'),
+            columns=pd.Index([variant_names[j] for j in variant_order], name='variant_type'),
+        )
+
+        # Completeness masks: OR each record's variant bit into its paper
+        variant_bits = np.array(
+            [VARIANT_BIT.get(vt, OTHER_VARIANT_BIT) for vt in variant_names], dtype=np.uint16
+        )
+        self.paper_masks = np.zeros(n_papers, dtype=np.uint16)
+        np.bitwise_or.at(self.paper_masks, paper_codes, variant_bits[variant_codes])
+
+        # papers x variants length matrix, -1 where a paper lacks a variant;
+        # for a repeated (paper, variant) pair the last record wins
+        cells = paper_codes * n_variants + variant_codes
+        _, last_from_end = np.unique(cells[::-1], return_index=True)
+        last = len(cells) - 1 - last_from_end
+        lengths = np.full((n_papers, n_variants), -1, dtype=np.int64)
+        lengths.flat[cells[last]] = np.asarray(self.text_lengths, dtype=np.int64)[last]
+
+        orig_col = self.variant_index.get('original', -1)
+        if HAS_NUMBA and len(lengths) >= NUMBA_REDUCTION_MIN_PAPERS:
+            sums, counts = _reduction_sums_numba(lengths, orig_col)
+        else:
+            sums, counts = _reduction_sums_numpy(lengths, orig_col)
+        self.avg_reductions = {
+            vt: float(sums[j] / counts[j]) for j, vt in enumerate(variant_names) if counts[j]
+        }
+        return self
+
+
+if HAS_MSGSPEC:
+    class Record(msgspec.Struct):
+        """Fields of a dataset line that the analysis reads; everything else is skipped while decoding"""
+        variant_type: str
+        text: Optional[str] = ''
+        decision: Optional[str] = 'unknown'
+        original_id: Optional[str] = None
+        original_path: Optional[str] = None
+        rates: Optional[list] = None
+
+    _record_decoder = msgspec.json.Decoder(Record)
+    _DECODE_ERRORS = (json.JSONDecodeError, msgspec.DecodeError)
+else:
+    _DECODE_ERRORS = (json.JSONDecodeError,)
+
+
+def _decode_line(line: bytes) -> dict:
+    """Decode one JSONL line into a compact record dict (see _parse_line)"""
+    if HAS_MSGSPEC:
+        record = _record_decoder.decode(line)
+        return {
+            'variant_type': record.variant_type,
+            'decision': record.decision,
+            'rates': record.rates,
+            'text_length': len(record.text or ''),
+            'paper_id': record.original_id or record.original_path,
+        }
+    item = json_loads(line)
+    item['text_length'] = len(item.pop('text', None) or '')
+    item['paper_id'] = item.get('original_id') or item.get('original_path')
+    return item
+
+
+def _parse_line(line: bytes) -> Optional[dict]:
+    """Parse one JSONL line into a compact record; None for blank/bad lines
+
+    The bulky text field is replaced by its length, and the paper key is resolved once into paper_id.
+    """
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        return _decode_line(line)
+    except _DECODE_ERRORS as e:
+        print(f"[ERROR] Failed to parse line: {e}")
+        return None
+
+
+def iter_jsonl(file_path: Path) -> Iterator[dict]:
+    """Yield parsed records from a JSONL file one at a time"""
     if not file_path.exists():
         print(f"[WARN] File does not exist: {file_path}")
-        return data
+        return
 
-    with file_path.open("r", encoding="utf-8") as f:
+    # Binary mode: both decoders accept UTF-8 bytes, which skips a decode step
+    with file_path.open("rb") as f:
         for line in f:
-            line = line.strip()
-            if line:
-                try:
-                    data.append(json.loads(line))
-                except json.JSONDecodeError as e:
-                    print(f"[ERROR] Failed to parse line: {e}")
-
-    return data
-
-
-def plot_variant_distribution(data, output_path):
+            item = _parse_line(line)
+            if item is not None:
+                yield item
+
+
+def _chunk_boundaries(file_path: Path, size: int, n_chunks: int) -> List[int]:
+    """Split the file into n_chunks byte ranges, moving each boundary forward to the next line start"""
+    bounds = [0]
+    with file_path.open("rb") as f:
+        for i in range(1, n_chunks):
+            f.seek(i * size // n_chunks)
+            f.readline()
+            pos = f.tell()
+            if bounds[-1] < pos < size:
+                bounds.append(pos)
+    bounds.append(size)
+    return bounds
+
+
+def _aggregate_byte_range(file_path: Path, start: int, end: int) -> Aggregates:
+    """Process-pool worker: aggregate the lines in [start, end) of a memory-mapped file (not finalized)"""
+    agg = Aggregates()
+    with file_path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        pos = start
+        while pos < end:
+            newline = mm.find(b'\n', pos, end)
+            if newline == -1:
+                newline = end
+            item = _parse_line(mm[pos:newline])
+            if item is not None:
+                agg.add(item)
+            pos = newline + 1
+    return agg
+
+
+def aggregate_byte_ranges(file_path: Path, workers: int) -> Aggregates:
+    """Parse a large JSONL file in parallel by line-aligned byte ranges and merge the partial aggregates"""
+    size = file_path.stat().st_size
+    bounds = _chunk_boundaries(file_path, size, workers)
+    agg = Aggregates()
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        # map() yields in submission order, so records keep their file order after merging
+        for part in ex.map(_aggregate_byte_range, repeat(file_path), bounds[:-1], bounds[1:]):
+            agg.merge(part)
+    return agg.finalize()
+
+
+def read_arrow_records(file_path: Path) -> Iterator[dict]:
+    """Parse a JSONL file with pyarrow and return an iterator of records without the text column
+
+    Text lengths are computed column-wise with utf8_length before the text is dropped.
+    Raises pyarrow.ArrowInvalid if the file does not parse cleanly.
+    """
+    schema = pa.schema([
+        ('variant_type', pa.string()),
+        ('text', pa.string()),
+        ('decision', pa.string()),
+        ('original_id', pa.string()),
+        ('original_path', pa.string()),
+        ('rates', pa.list_(pa.int64())),
+    ])
+    table = pa_json.read_json(
+        str(file_path),
+        read_options=pa_json.ReadOptions(use_threads=True, block_size=ARROW_BLOCK_SIZE),
+        parse_options=pa_json.ParseOptions(explicit_schema=schema, unexpected_field_behavior='ignore'),
+    )
+    text_length = pc.fill_null(pc.utf8_length(table['text']), 0)
+    table = table.select([name for name in table.column_names if name != 'text'])
+    table = table.append_column('text_length', text_length)
+
+    def _rows():
+        for batch in table.to_batches():
+            for row in batch.to_pylist():
+                # Missing fields come back as nulls (indistinguishable from explicit nulls); drop them so
+                # .get() defaults still apply. Aggregates.add treats both kinds of null decision alike.
+                item = {k: v for k, v in row.items() if v is not None}
+                item['paper_id'] = item.get('original_id') or item.get('original_path')
+                yield item
+
+    return _rows()
+
+
+def aggregate_records(records: Iterable[dict]) -> Aggregates:
+    """Stream records into an Aggregates instance"""
+    agg = Aggregates()
+    for item in records:
+        agg.add(item)
+    return agg.finalize()
+
+
+def load_dataset(file_path: Path, workers: Optional[int] = None) -> Aggregates:
+    """Load dataset from JSONL file, aggregating it in a single streaming pass
+
+    Uses pyarrow when installed; otherwise large files (>= PARALLEL_PARSE_MIN_BYTES)
+    are parsed by a process pool over byte ranges, and the rest line by line.
+    """
+    records = None
+    if HAS_PYARROW and file_path.exists():
+        try:
+            records = read_arrow_records(file_path)
+        except pa.ArrowInvalid as e:
+            print(f"[WARN] Arrow JSON reader failed, falling back to line-by-line parsing: {e}")
+    if records is None:
+        if workers is None:
+            workers = min(8, os.cpu_count() or 1)
+        if workers > 1 and file_path.exists() and file_path.stat().st_size >= PARALLEL_PARSE_MIN_BYTES:
+            return aggregate_byte_ranges(file_path, workers)
+        records = iter_jsonl(file_path)
+    return aggregate_records(records)
+
+
+PLOT_DPI = 300
+
+# One Figure per process, cleared and resized for each plot instead of being recreated
+_shared_figure = None
+# PNG encoding runs on background threads (it releases the GIL) while the next plot is drawn
+_png_writer = None
+_pending_writes = []
+
+
+def _prepare_axes(ax, figsize):
+    """Return (fig, ax) sized to figsize, reusing the shared figure when no ax is given"""
+    global _shared_figure
+    if ax is None:
+        if _shared_figure is None:
+            _shared_figure = plt.figure()
+        fig = _shared_figure
+        fig.clf()
+        ax = fig.add_subplot()
+    else:
+        fig = ax.figure
+        ax.cla()
+    fig.set_size_inches(figsize)
+    return fig, ax
+
+
+def _save_figure(fig, path, dpi=PLOT_DPI):
+    """Rasterize fig now and queue the PNG encode/write on a background thread
+
+    The pixels are copied out before returning, so the shared figure can be cleared right away.
+    """
+    global _png_writer
+    original_dpi = fig.dpi
+    fig.dpi = dpi
+    try:
+        fig.canvas.draw()
+        rgba = np.array(fig.canvas.buffer_rgba())
+    finally:
+        fig.dpi = original_dpi
+    if _png_writer is None:
+        _png_writer = ThreadPoolExecutor(max_workers=2)
+    _pending_writes.append(_png_writer.submit(matplotlib.image.imsave, path, rgba, format='png', dpi=dpi))
+
+
+def _wait_for_writes():
+    """Block until every queued PNG has been written, re-raising any write error"""
+    while _pending_writes:
+        _pending_writes.pop(0).result()
+
+
+def plot_variant_distribution(agg: Aggregates, output_path, ax=None):
     """Plot variant type distribution"""
-    variant_counts = Counter(item["variant_type"] for item in data)
-
-    plt.figure(figsize=(10, 6))
-    plt.bar(variant_counts.keys(), variant_counts.values(), color='skyblue', edgecolor='black')
-    plt.xlabel('Variant Type', fontsize=12)
-    plt.ylabel('Count', fontsize=12)
-    plt.title('Variant Type Distribution', fontsize=14, fontweight='bold')
-    plt.xticks(rotation=45, ha='right')
-    plt.tight_layout()
-    plt.savefig(output_path / 'variant_distribution.png', dpi=300)
-    plt.close()
+    variant_counts = agg.variant_counts
+
+    fig, ax = _prepare_axes(ax, (10, 6))
+    ax.bar(variant_counts.keys(), variant_counts.values(), color='skyblue', edgecolor='black')
+    ax.set_xlabel('Variant Type', fontsize=12)
+    ax.set_ylabel('Count', fontsize=12)
+    ax.set_title('Variant Type Distribution', fontsize=14, fontweight='bold')
+    plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
+    fig.tight_layout()
+    _save_figure(fig, output_path / 'variant_distribution.png')
     print(f"[INFO] Saved: variant_distribution.png")
 
 
-def plot_text_length_comparison(data, output_path):
+def plot_text_length_comparison(agg: Aggregates, output_path, ax=None):
     """Plot text length comparison across variants"""
-    df_data = []
-    for item in data:
-        df_data.append({
-            'variant_type': item['variant_type'],
-            'text_length': len(item['text'])
-        })
-
-    df = pd.DataFrame(df_data)
-
-    plt.figure(figsize=(14, 6))
-    sns.boxplot(data=df, x='variant_type', y='text_length', palette='Set2')
-    plt.xlabel('Variant Type', fontsize=12)
-    plt.ylabel('Text Length (characters)', fontsize=12)
-    plt.title('Text Length Distribution by Variant Type', fontsize=14, fontweight='bold')
-    plt.xticks(rotation=45, ha='right')
-    plt.tight_layout()
-    plt.savefig(output_path / 'text_length_distribution.png', dpi=300)
-    plt.close()
+    # Built column-wise; the categorical keeps first-seen variant order and groups on integer codes
+    df = pd.DataFrame({
+        'variant_type': pd.Categorical.from_codes(agg.variant_codes, agg.variant_names),
+        'text_length': np.asarray(agg.text_lengths, dtype=np.int64),
+    })
+
+    fig, ax = _prepare_axes(ax, (14, 6))
+    sns.boxplot(data=df, x='variant_type', y='text_length', palette='Set2', ax=ax)
+    ax.set_xlabel('Variant Type', fontsize=12)
+    ax.set_ylabel('Text Length (characters)', fontsize=12)
+    ax.set_title('Text Length Distribution by Variant Type', fontsize=14, fontweight='bold')
+    plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
+    fig.tight_layout()
+    _save_figure(fig, output_path / 'text_length_distribution.png')
     print(f"[INFO] Saved: text_length_distribution.png")
 
 
-def plot_text_reduction(data, output_path):
+def plot_text_reduction(agg: Aggregates, output_path, ax=None):
     """Plot text reduction percentage by variant"""
-    # Group by original paper
-    papers = defaultdict(dict)
-    for item in data:
-        original_id = item.get('original_id') or item.get('original_path')
-        papers[original_id][item['variant_type']] = len(item['text'])
-
-    # Calculate reduction
-    reductions = defaultdict(list)
-    for paper_id, variants in papers.items():
-        original_len = variants.get('original', 1)
-        if original_len == 0:
-            continue
-        for variant_type, length in variants.items():
-            if variant_type != 'original':
-                reduction_pct = (1 - length / original_len) * 100
-                reductions[variant_type].append(reduction_pct)
-
-    # Plot
-    avg_reductions = {k: sum(v) / len(v) for k, v in reductions.items()}
+    # Reductions are computed per paper in Aggregates.finalize
+    avg_reductions = agg.avg_reductions
 
-    plt.figure(figsize=(10, 6))
+    fig, ax = _prepare_axes(ax, (10, 6))
     variant_types = sorted(avg_reductions.keys())
     values = [avg_reductions[k] for k in variant_types]
 
-    bars = plt.bar(variant_types, values, color='coral', edgecolor='black')
-    plt.xlabel('Variant Type', fontsize=12)
-    plt.ylabel('Average Text Reduction (%)', fontsize=12)
-    plt.title('Average Text Reduction by Variant Type', fontsize=14, fontweight='bold')
-    plt.xticks(rotation=45, ha='right')
-    plt.axhline(y=0, color='gray', linestyle='--', linewidth=0.8)
+    bars = ax.bar(variant_types, values, color='coral', edgecolor='black')
+    ax.set_xlabel('Variant Type', fontsize=12)
+    ax.set_ylabel('Average Text Reduction (%)', fontsize=12)
+    ax.set_title('Average Text Reduction by Variant Type', fontsize=14, fontweight='bold')
+    plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
+    ax.axhline(y=0, color='gray', linestyle='--', linewidth=0.8)
 
     # Add value labels on bars
     for bar, value in zip(bars, values):
         height = bar.get_height()
-        plt.text(bar.get_x() + bar.get_width()/2., height,
+        ax.text(bar.get_x() + bar.get_width()/2., height,
                 f'{value:.1f}%', ha='center', va='bottom', fontsize=9)
 
-    plt.tight_layout()
-    plt.savefig(output_path / 'text_reduction.png', dpi=300)
-    plt.close()
+    fig.tight_layout()
+    _save_figure(fig, output_path / 'text_reduction.png')
     print(f"[INFO] Saved: text_reduction.png")
 
 
-def plot_decision_distribution(data, output_path):
+def plot_decision_distribution(agg: Aggregates, output_path, ax=None):
     """Plot decision distribution by variant type"""
-    df_data = []
-    for item in data:
-        decision = item.get('decision', 'unknown')
-        df_data.append({
-            'variant_type': item['variant_type'],
-            'decision': decision if decision else 'unknown'
-        })
-
-    df = pd.DataFrame(df_data)
-
-    # Create pivot table
-    pivot = df.pivot_table(index='decision', columns='variant_type', aggfunc='size', fill_value=0)
-
-    plt.figure(figsize=(14, 6))
-    sns.heatmap(pivot, annot=True, fmt='d', cmap='YlOrRd', cbar_kws={'label': 'Count'})
-    plt.xlabel('Variant Type', fontsize=12)
-    plt.ylabel('Decision', fontsize=12)
-    plt.title('Decision vs Variant Type Heatmap', fontsize=14, fontweight='bold')
-    plt.tight_layout()
-    plt.savefig(output_path / 'decision_variant_heatmap.png', dpi=300)
-    plt.close()
+    pivot = agg.decision_matrix
+
+    fig, ax = _prepare_axes(ax, (14, 6))
+    sns.heatmap(pivot, annot=True, fmt='d', cmap='YlOrRd', cbar_kws={'label': 'Count'}, ax=ax)
+    ax.set_xlabel('Variant Type', fontsize=12)
+    ax.set_ylabel('Decision', fontsize=12)
+    ax.set_title('Decision vs Variant Type Heatmap', fontsize=14, fontweight='bold')
+    fig.tight_layout()
+    _save_figure(fig, output_path / 'decision_variant_heatmap.png')
     print(f"[INFO] Saved: decision_variant_heatmap.png")
 
 
-def plot_rating_distribution(data, output_path):
+def plot_rating_distribution(agg: Aggregates, output_path, ax=None):
     """Plot rating score distribution"""
-    ratings = []
-    for item in data:
-        if item.get('rates'):
-            ratings.extend(item['rates'])
+    ratings_hist = agg.ratings_hist
 
-    if not ratings:
+    if not ratings_hist.any():
         print("[WARN] No rating data available")
         return
 
-    plt.figure(figsize=(10, 6))
-    plt.hist(ratings, bins=range(1, 12), color='lightgreen', edgecolor='black', alpha=0.7)
-    plt.xlabel('Rating Score', fontsize=12)
-    plt.ylabel('Frequency', fontsize=12)
-    plt.title('Rating Score Distribution', fontsize=14, fontweight='bold')
-    plt.xticks(range(1, 11))
-    plt.grid(axis='y', alpha=0.3)
-    plt.tight_layout()
-    plt.savefig(output_path / 'rating_distribution.png', dpi=300)
-    plt.close()
+    fig, ax = _prepare_axes(ax, (10, 6))
+    # One unit-wide bar per rating, spanning [r, r + 1] like a histogram with integer bins
+    ax.bar(np.arange(1, RATING_MAX + 1), ratings_hist[1:], width=1, align='edge',
+           color='lightgreen', edgecolor='black', alpha=0.7)
+    ax.set_xlabel('Rating Score', fontsize=12)
+    ax.set_ylabel('Frequency', fontsize=12)
+    ax.set_title('Rating Score Distribution', fontsize=14, fontweight='bold')
+    ax.set_xticks(range(1, 11))
+    ax.grid(axis='y', alpha=0.3)
+    fig.tight_layout()
+    _save_figure(fig, output_path / 'rating_distribution.png')
     print(f"[INFO] Saved: rating_distribution.png")
 
 
-def generate_statistics_report(data, output_path):
+def generate_statistics_report(agg: Aggregates, output_path):
     """Generate detailed statistics report"""
     report = []
     report.append("=" * 60)
@@ -184,67 +576,53 @@ def generate_statistics_report(data, output_path):
     report.append("")
 
     # Basic statistics
-    report.append(f"Total records: {len(data)}")
+    report.append(f"Total records: {agg.total_records}")
 
     # Unique papers
-    unique_papers = set(item.get('original_id') or item.get('original_path') for item in data)
-    report.append(f"Unique papers: {len(unique_papers)}")
+    report.append(f"Unique papers: {len(agg.paper_index)}")
 
     # Variant counts
-    variant_counts = Counter(item['variant_type'] for item in data)
     report.append(f"\nVariant type counts:")
-    for variant, count in sorted(variant_counts.items()):
+    for variant, count in sorted(agg.variant_counts.items()):
         report.append(f"  - {variant}: {count}")
 
     # Decision counts
-    decision_counts = Counter(item.get('decision', 'unknown') for item in data)
     report.append(f"\nDecision counts:")
-    for decision, count in sorted(decision_counts.items()):
+    for decision, count in sorted(agg.decision_counts.items()):
         report.append(f"  - {decision}: {count}")
 
     # Text length statistics
-    text_lengths = [len(item['text']) for item in data]
+    text_lengths = np.asarray(agg.text_lengths, dtype=np.int64)
     report.append(f"\nText length statistics:")
-    report.append(f"  - Mean: {sum(text_lengths) / len(text_lengths):.2f} chars")
-    report.append(f"  - Min: {min(text_lengths)} chars")
-    report.append(f"  - Max: {max(text_lengths)} chars")
+    report.append(f"  - Mean: {text_lengths.sum() / len(text_lengths):.2f} chars")
+    report.append(f"  - Min: {text_lengths.min()} chars")
+    report.append(f"  - Max: {text_lengths.max()} chars")
 
     # Rating statistics
-    all_ratings = []
-    for item in data:
-        if item.get('rates'):
-            all_ratings.extend(item['rates'])
-
-    if all_ratings:
+    if agg.rating_count:
         report.append(f"\nRating statistics:")
-        report.append(f"  - Total ratings: {len(all_ratings)}")
-        report.append(f"  - Mean rating: {sum(all_ratings) / len(all_ratings):.2f}")
-        report.append(f"  - Min rating: {min(all_ratings)}")
-        report.append(f"  - Max rating: {max(all_ratings)}")
+        report.append(f"  - Total ratings: {agg.rating_count}")
+        report.append(f"  - Mean rating: {agg.rating_sum / agg.rating_count:.2f}")
+        report.append(f"  - Min rating: {agg.rating_min}")
+        report.append(f"  - Max rating: {agg.rating_max}")
 
     # Check data completeness
     report.append(f"\nData completeness check:")
-    papers_variants = defaultdict(set)
-    for item in data:
-        original_id = item.get('original_id') or item.get('original_path')
-        papers_variants[original_id].add(item['variant_type'])
+    paper_ids = list(agg.paper_index)
+    masks = agg.paper_masks
+    complete = masks == FULL_VARIANT_MASK
 
-    expected_variants = {
-        'original', 'no_abstract', 'no_conclusion', 'no_introduction',
-        'no_references', 'no_experiments', 'no_methods', 'no_formulas', 'no_figures'
-    }
+    complete_papers = int(complete.sum())
+    report.append(f"  - Complete papers (all 9 variants): {complete_papers}/{len(paper_ids)}")
 
-    complete_papers = sum(1 for variants in papers_variants.values() if variants == expected_variants)
-    report.append(f"  - Complete papers (all 9 variants): {complete_papers}/{len(papers_variants)}")
+    incomplete_idx = np.flatnonzero(~complete)
 
-    incomplete = [(pid, expected_variants - variants)
-                  for pid, variants in papers_variants.items()
-                  if variants != expected_variants]
-
-    if incomplete:
-        report.append(f"  - Incomplete papers: {len(incomplete)}")
-        for pid, missing in incomplete[:5]:
-            report.append(f"    * {pid}: missing {missing}")
+    if len(incomplete_idx):
+        report.append(f"  - Incomplete papers: {len(incomplete_idx)}")
+        for i in incomplete_idx[:5]:
+            missing_bits = int(~masks[i]) & FULL_VARIANT_MASK
+            missing = {name for name, bit in VARIANT_BIT.items() if missing_bits & bit}
+            report.append(f"    * {paper_ids[i]}: missing {missing}")
 
     report.append("")
     report.append("=" * 60)
@@ -258,48 +636,73 @@ def generate_statistics_report(data, output_path):
     print(f"\n[INFO] Saved: statistics_report.txt")
 
 
-def main():
+PLOT_FUNCTIONS = (
+    plot_variant_distribution,
+    plot_text_length_comparison,
+    plot_text_reduction,
+    plot_decision_distribution,
+    plot_rating_distribution,
+)
+
+
+def _run_plot_task(fn, agg, output_path):
+    """Process-pool worker: draw one plot and wait for its PNG to be written"""
+    fn(agg, output_path)
+    _wait_for_writes()
+
+
+def _run_plot_tasks(tasks, workers: Optional[int]):
+    """Render independent figures, in worker processes when more than one worker is requested"""
+    if workers is None:
+        workers = min(8, os.cpu_count() or 1, len(tasks))
+    if workers <= 1:
+        for fn, agg, output_path in tasks:
+            fn(agg, output_path)
+        _wait_for_writes()
+        return
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        futures = [ex.submit(_run_plot_task, fn, agg, output_path) for fn, agg, output_path in tasks]
+        for future in futures:
+            future.result()
+
+
+def main(workers: Optional[int] = None):
     """Main analysis function"""
     print("[INFO] Starting dataset analysis...")
 
     # Load data
     print("\n[INFO] Loading datasets...")
-    train_data = load_dataset(TRAIN_FILE)
-    test_data = load_dataset(TEST_FILE)
+    train_data = load_dataset(TRAIN_FILE, workers)
+    test_data = load_dataset(TEST_FILE, workers)
 
-    if not train_data and not test_data:
+    if not train_data.total_records and not test_data.total_records:
         print("[ERROR] No data loaded. Please check file paths.")
         return
 
-    # Analyze train set
-    if train_data:
-        print(f"\n[INFO] Analyzing training set ({len(train_data)} records)...")
-        train_output = OUTPUT_DIR / "train"
-        train_output.mkdir(exist_ok=True)
-
-        plot_variant_distribution(train_data, train_output)
-        plot_text_length_comparison(train_data, train_output)
-        plot_text_reduction(train_data, train_output)
-        plot_decision_distribution(train_data, train_output)
-        plot_rating_distribution(train_data, train_output)
-        generate_statistics_report(train_data, train_output)
-
-    # Analyze test set
-    if test_data:
-        print(f"\n[INFO] Analyzing test set ({len(test_data)} records)...")
-        test_output = OUTPUT_DIR / "test"
-        test_output.mkdir(exist_ok=True)
-
-        plot_variant_distribution(test_data, test_output)
-        plot_text_length_comparison(test_data, test_output)
-        plot_text_reduction(test_data, test_output)
-        plot_decision_distribution(test_data, test_output)
-        plot_rating_distribution(test_data, test_output)
-        generate_statistics_report(test_data, test_output)
+    # Plots for both sets are collected first and rendered together
+    plot_tasks = []
+    for name, agg in (("training", train_data), ("test", test_data)):
+        if not agg.total_records:
+            continue
+        print(f"\n[INFO] Analyzing {name} set ({agg.total_records} records)...")
+        output_path = OUTPUT_DIR / ("train" if name == "training" else "test")
+        output_path.mkdir(exist_ok=True)
+
+        # Plots only need the finalized counts plus variant codes and lengths; keep the rest out of the worker payload
+        plot_agg = replace(agg, decision_index={}, decision_codes=[],
+                           paper_index={}, paper_codes=[], paper_masks=None)
+        plot_tasks.extend((fn, plot_agg, output_path) for fn in PLOT_FUNCTIONS)
+        generate_statistics_report(agg, output_path)
+
+    _run_plot_tasks(plot_tasks, workers)
 
     print(f"\n[INFO] Analysis complete! Results saved to {OUTPUT_DIR}/")
 
 
 if __name__ == "__main__":
-    main()
-
+    parser = argparse.ArgumentParser(description="Analyze and visualize the paper variant dataset")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Processes used to parse large files and render plots "
+                             "(default: min(8, CPU count); 1 keeps everything in-process)")
+    args = parser.parse_args()
+    main(workers=args.workers)
@@ -3,27 +3,119 @@ Analysis Script for Paper Evaluation Results
 Performs comprehensive statistical analysis and visualization of evaluation results
 """
 
+import argparse
 import json
+import os
+import matplotlib
+matplotlib.use('Agg')  # headless: plots are also rendered in worker processes
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from pathlib import Path
 from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
+from typing import Optional
 import scipy.stats as stats
 
+# polars computes the summary aggregates as one lazy query plan with a single collect
+try:
+    import polars as pl
+    HAS_POLARS = True
+except ImportError:
+    HAS_POLARS = False
+
+# numba compiles the pairwise correlation kernel for very large result sets
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    njit = prange = None
+    HAS_NUMBA = False
+
+# pyarrow converts the parsed columns to typed arrays in C
+try:
+    import pyarrow as pa
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# orjson parses bytes directly and encodes in C (numpy scalars included); much faster than the stdlib
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    orjson = None
+    HAS_ORJSON = False
+
+json_loads = orjson.loads if HAS_ORJSON else json.loads
+
 
 # ========== Configuration ==========
 PROJECT_ROOT = Path(__file__).parent.parent
 RESULTS_DIR = PROJECT_ROOT / "evaluation_results"
 OUTPUT_DIR = PROJECT_ROOT / "analysis_output"
+# Parsed-results Parquet cache; kept out of the tracked evaluation_results/ data directory
+CACHE_DIR = PROJECT_ROOT / ".cache" / "evaluation_results"
 RATING_BINS = [0, 3, 5, 7, 10]  # Rating ranges: Poor, Fair, Good, Excellent
 RATING_LABELS = ['Poor (0-3)', 'Fair (3-5)', 'Good (5-7)', 'Excellent (7-10)']
+RECORD_FIELDS = ['paper_id', 'title', 'variant_type', 'dataset_split', 'text_length']
+EVALUATION_FIELDS = ['avg_rating', 'paper_decision', 'confidence',
+                     'originality', 'quality', 'clarity', 'significance']
+# Length columns and the evaluation field each one measures
+LENGTH_FIELDS = ['num_strengths', 'num_weaknesses', 'meta_review_length']
+LENGTH_SOURCES = ['strength', 'weaknesses', 'meta_review']
+RESULTS_CACHE_VERSION = 1  # bump when the loaded frame's columns or dtypes change
+PLOT_DPI = 150  # screen/report resolution; 300 quadruples the pixels to rasterize and deflate
+# zlib level 1: much faster PNG encoding for slightly larger files
+SAVEFIG_KWARGS = {'dpi': PLOT_DPI, 'pil_kwargs': {'compress_level': 1}}
+SCATTER_MAX_POINTS = 5000  # per-point transforms dominate the scatter beyond this
+NUMBA_CORR_MIN_ROWS = 1_000_000  # above this (with numba installed) the correlation heatmap uses the compiled kernel
+
+
+def _parse_results_file(latest_file: Path) -> pd.DataFrame:
+    """Parse one evaluation results JSONL file into the flat analysis frame"""
+    # Load data: parse raw bytes (no text decoding pass) straight into one list per column
+    columns = {name: [] for name in RECORD_FIELDS + EVALUATION_FIELDS + LENGTH_FIELDS}
+    record_columns = [(name, columns[name]) for name in RECORD_FIELDS]
+    evaluation_columns = [(name, columns[name]) for name in EVALUATION_FIELDS]
+    length_columns = [(source, columns[name]) for name, source in zip(LENGTH_FIELDS, LENGTH_SOURCES)]
+    with open(latest_file, 'rb') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json_loads(line)
+            evaluation = record['evaluation']
+            for name, values in record_columns:
+                values.append(record[name])
+            for name, values in evaluation_columns:
+                values.append(evaluation[name])
+            for source, values in length_columns:
+                values.append(len(evaluation[source]))
+
+    # confidence mixes numbers, strings and lists, so it stays a plain object column
+    confidence = pd.Series(columns.pop('confidence'))
+    df = None
+    if HAS_PYARROW:
+        try:
+            df = pa.table(columns).to_pandas()
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            df = None  # mixed types within a column
+    if df is None:
+        df = pd.DataFrame(columns)
+    df.insert(df.columns.get_loc('paper_decision') + 1, 'confidence', confidence)
+
+    # Few distinct decisions: filter on integer codes instead of rescanning strings.
+    # Categories keep first-seen order so value_counts() breaks ties as before.
+    decisions = df['paper_decision']
+    df['paper_decision'] = pd.Categorical(decisions, categories=decisions.dropna().unique())
+    return df
 
 
 def load_latest_results(results_dir: Path) -> pd.DataFrame:
-    """Load the most recent evaluation results"""
+    """Load the most recent evaluation results (from the Parquet cache in CACHE_DIR when it is current)"""
     results_path = Path(results_dir)
 
     # Find latest results file
@@ -34,38 +126,60 @@ def load_latest_results(results_dir: Path) -> pd.DataFrame:
     latest_file = max(result_files, key=lambda p: p.stat().st_mtime)
     print(f"[INFO] Loading results from: {latest_file}")
 
-    # Load data
-    data = []
-    with open(latest_file, 'r', encoding='utf-8') as f:
-        for line in f:
-            if line.strip():
-                record = json.loads(line)
-                # Flatten evaluation dict for easier analysis
-                flat_record = {
-                    'paper_id': record['paper_id'],
-                    'title': record['title'],
-                    'variant_type': record['variant_type'],
-                    'dataset_split': record['dataset_split'],
-                    'text_length': record['text_length'],
-                    'avg_rating': record['evaluation']['avg_rating'],
-                    'paper_decision': record['evaluation']['paper_decision'],
-                    'confidence': record['evaluation']['confidence'],
-                    'originality': record['evaluation']['originality'],
-                    'quality': record['evaluation']['quality'],
-                    'clarity': record['evaluation']['clarity'],
-                    'significance': record['evaluation']['significance'],
-                    'num_strengths': len(record['evaluation']['strength']),
-                    'num_weaknesses': len(record['evaluation']['weaknesses']),
-                    'meta_review_length': len(record['evaluation']['meta_review'])
-                }
-                data.append(flat_record)
-
-    df = pd.DataFrame(data)
+    # Cache key: source name + mtime + size (+ layout version), so an edited file is reparsed
+    file_stat = latest_file.stat()
+    cache_file = CACHE_DIR / (
+        f"{latest_file.name}.{file_stat.st_mtime_ns}-{file_stat.st_size}.v{RESULTS_CACHE_VERSION}.parquet")
+    if HAS_PYARROW and cache_file.exists():
+        df = pd.read_parquet(cache_file)
+        print(f"[INFO] Loaded {len(df)} evaluation records (cached)")
+        return df
+
+    df = _parse_results_file(latest_file)
+    # Parquet needs one type per column; fix_confidence_column is idempotent, so normalize here
+    df = fix_confidence_column(df)
     print(f"[INFO] Loaded {len(df)} evaluation records")
 
+    if HAS_PYARROW:
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            for stale in CACHE_DIR.glob(f"{latest_file.name}.*.parquet"):
+                stale.unlink(missing_ok=True)
+            df.to_parquet(cache_file, compression='zstd', index=False)
+        except (OSError, pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            # The cache is best-effort: e.g. a mixed-type object column cannot be stored as Parquet
+            cache_file.unlink(missing_ok=True)
+            print(f"[WARN] Could not write results cache {cache_file}: {e}")
+
     return df
 
 
+def dump_json(obj, path: Path):
+    """Write obj as indented UTF-8 JSON (orjson writes NaN as null, the stdlib writes NaN)"""
+    if HAS_ORJSON:
+        Path(path).write_bytes(orjson.dumps(
+            obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(obj, f, indent=2, ensure_ascii=False)
+
+
+def save_table(df: pd.DataFrame, output_path: Path, name: str, as_csv: bool = False) -> Path:
+    """Write a result table as zstd Parquet, or CSV when requested, pyarrow is missing,
+    or a column cannot be converted to Arrow (e.g. mixed-type object columns)"""
+    if not as_csv and HAS_PYARROW:
+        table_file = output_path / f'{name}.parquet'
+        try:
+            df.to_parquet(table_file, compression='zstd', index=False)
+            return table_file
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            table_file.unlink(missing_ok=True)
+            print(f"[WARN] Could not write {name} as Parquet, writing CSV instead: {e}")
+    table_file = output_path / f'{name}.csv'
+    df.to_csv(table_file, index=False)
+    return table_file
+
+
 def create_output_dir(output_dir: Path) -> Path:
     """Create output directory with timestamp"""
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -76,42 +190,148 @@ def create_output_dir(output_dir: Path) -> Path:
 
 def fix_confidence_column(df):
     """Fix confidence column to ensure it's a float and robust to bad data"""
-    def to_float(x):
-        if isinstance(x, list):
-            # 只处理全为数字的 list
-            numeric = []
-            for i in x:
-                if isinstance(i, (int, float)):
-                    numeric.append(float(i))
-                elif isinstance(i, str):
-                    try:
-                        numeric.append(float(i))
-                    except Exception:
-                        continue
-            return float(np.mean(numeric)) if numeric else np.nan
-        if isinstance(x, (int, float)):
-            return float(x)
-        if isinstance(x, str):
-            try:
-                return float(x)
-            except Exception:
-                return np.nan
-        return np.nan
-    df['confidence'] = df['confidence'].apply(to_float)
+    confidence = df['confidence']
+    is_list = confidence.map(type).eq(list)
+
+    # 标量直接转数值, 无法解析的变成 NaN
+    scalar = pd.to_numeric(confidence.where(~is_list), errors='coerce').astype('float64')
+
+    # list 只取其中能解析成数字的元素求均值 (空 list 或全无效则为 NaN)
+    items = pd.to_numeric(confidence[is_list].explode(), errors='coerce').astype('float64')
+    list_means = items.groupby(level=0).mean()
+
+    df['confidence'] = scalar.fillna(list_means)
     return df
 
 
-def analyze_overall_statistics(df: pd.DataFrame, output_path: Path):
+def _rating_range_summary(triples) -> dict:
+    """{rating label: count and variant distribution} from (label, variant, count) triples in first-seen order"""
+    range_counts = {}
+    for label, variant, count in triples:
+        range_counts.setdefault(label, []).append((variant, count))
+    rating_ranges = {}
+    for label, pairs in range_counts.items():
+        # same ordering as value_counts(): by count, descending, from first-seen order
+        known = [(variant, count) for variant, count in pairs if not pd.isna(variant)]
+        variant_counts = pd.Series([count for _, count in known],
+                                   index=[variant for variant, _ in known], dtype='int64')
+        rating_ranges[label] = {
+            'count': sum(count for _, count in pairs),
+            'variant_distribution': variant_counts.sort_values(ascending=False).to_dict(),
+        }
+    return rating_ranges
+
+
+def summarize_with_polars(df: pd.DataFrame) -> dict:
+    """Compute rating, per-variant and per-rating-range aggregates in one polars pass
+
+    The three queries share one in-memory frame and are executed together by
+    pl.collect_all, so the rating column is read once instead of once per
+    analyze_* function and variant/range filter.
+    """
+    frame = pl.DataFrame([
+        pl.Series('variant_type', df['variant_type'].tolist(), dtype=pl.String),
+        pl.Series('paper_decision', df['paper_decision'].tolist(), dtype=pl.String),
+        pl.Series('avg_rating', df['avg_rating'].to_numpy(dtype=np.float64), nan_to_null=True),
+    ])
+    lf = frame.lazy()
+    rating = pl.col('avg_rating')
+    decision = pl.col('paper_decision')
+
+    overall_query = lf.select(
+        rating.mean().alias('mean'),
+        rating.median().alias('median'),
+        rating.std().alias('std'),
+        rating.min().alias('min'),
+        rating.max().alias('max'),
+        rating.quantile(0.25, interpolation='linear').alias('q25'),
+        rating.quantile(0.75, interpolation='linear').alias('q75'),
+    )
+    variant_query = lf.group_by('variant_type', maintain_order=True).agg(
+        pl.len().alias('count'),
+        rating.mean().alias('avg_rating_mean'),
+        rating.std().alias('avg_rating_std'),
+        decision.str.contains('(?i)accept').sum().alias('accept'),
+        decision.str.contains('(?i)reject').sum().alias('reject'),
+    )
+    # pd.cut(..., include_lowest=True) semantics: [0, 3], (3, 5], (5, 7], (7, 10]
+    range_query = (
+        lf.filter(rating.is_between(RATING_BINS[0], RATING_BINS[-1]))
+        .with_columns(rating.cut(RATING_BINS[1:-1], labels=RATING_LABELS).alias('rating_bin'))
+        .group_by(['rating_bin', 'variant_type'], maintain_order=True)
+        .agg(pl.len().alias('count'))
+    )
+    overall, variants, ranges = pl.collect_all([overall_query, variant_query, range_query])
+
+    variant_stats = []
+    for row in variants.iter_rows(named=True):
+        count = row['count']
+        variant_stats.append({
+            'variant_type': row['variant_type'],
+            'count': count,
+            'avg_rating_mean': row['avg_rating_mean'],
+            'avg_rating_std': row['avg_rating_std'],
+            'accept_rate': row['accept'] / count * 100,
+            'reject_rate': row['reject'] / count * 100,
+        })
+
+    rating_ranges = _rating_range_summary(
+        (row['rating_bin'], row['variant_type'], row['count']) for row in ranges.iter_rows(named=True))
+
+    return {
+        'rating_statistics': overall.row(0, named=True),
+        'variant_stats': variant_stats,
+        'rating_ranges': rating_ranges,
+    }
+
+
+def decision_mask(decisions: pd.Series, keyword: str) -> pd.Series:
+    """Rows whose decision contains keyword (case-insensitive), tested once per category"""
+    if not isinstance(decisions.dtype, pd.CategoricalDtype):
+        decisions = decisions.astype('category')
+    matching = [c for c in decisions.cat.categories if keyword.lower() in str(c).lower()]
+    return decisions.isin(matching)
+
+
+def is_accept(df: pd.DataFrame) -> pd.Series:
+    return decision_mask(df['paper_decision'], 'accept')
+
+
+def is_reject(df: pd.DataFrame) -> pd.Series:
+    return decision_mask(df['paper_decision'], 'reject')
+
+
+@dataclass
+class AnalysisContext:
+    """Derived per-row masks and groupings shared by the analyze_* and plotting functions"""
+    is_accept: pd.Series
+    is_reject: pd.Series
+    variant_gb: object  # DataFrameGroupBy over avg_rating / is_accept / is_reject
+    summary: Optional[dict] = None
+
+
+def build_analysis_context(df: pd.DataFrame, summary: dict = None) -> AnalysisContext:
+    """Build the decision masks and the variant grouping once for the whole run"""
+    accept = is_accept(df)
+    reject = is_reject(df)
+    # Kept off df so the processed_data output keeps its columns
+    frame = pd.DataFrame({'avg_rating': df['avg_rating'], 'is_accept': accept, 'is_reject': reject})
+    variant_gb = frame.groupby(df['variant_type'], sort=False)
+    return AnalysisContext(is_accept=accept, is_reject=reject, variant_gb=variant_gb, summary=summary)
+
+
+def analyze_overall_statistics(df: pd.DataFrame, output_path: Path, ctx: AnalysisContext = None):
     """Generate overall statistics"""
     print("\n" + "="*70)
     print("OVERALL STATISTICS")
     print("="*70)
 
     df = fix_confidence_column(df)
+    summary = ctx.summary if ctx else None
 
     stats_dict = {
         'total_papers': len(df),
-        'rating_statistics': {
+        'rating_statistics': summary['rating_statistics'] if summary else {
             'mean': df['avg_rating'].mean(),
             'median': df['avg_rating'].median(),
             'std': df['avg_rating'].std(),
@@ -141,37 +361,37 @@ def analyze_overall_statistics(df: pd.DataFrame, output_path: Path):
 
     # Save to JSON
     stats_file = output_path / 'overall_statistics.json'
-    with open(stats_file, 'w', encoding='utf-8') as f:
-        json.dump(stats_dict, f, indent=2, ensure_ascii=False)
+    dump_json(stats_dict, stats_file)
     print(f"\n[INFO] Saved statistics to {stats_file}")
 
     return stats_dict
 
 
-def analyze_by_variant(df: pd.DataFrame, output_path: Path):
+def analyze_by_variant(df: pd.DataFrame, output_path: Path, ctx: AnalysisContext = None,
+                       as_csv: bool = False):
     """Analyze results grouped by variant type"""
     print("\n" + "="*70)
     print("ANALYSIS BY VARIANT TYPE")
     print("="*70)
 
-    variant_stats = []
-
-    for variant in df['variant_type'].unique():
-        variant_df = df[df['variant_type'] == variant]
-
-        stats = {
-            'variant_type': variant,
-            'count': len(variant_df),
-            'avg_rating_mean': variant_df['avg_rating'].mean(),
-            'avg_rating_std': variant_df['avg_rating'].std(),
-            # 移除originality, quality, clarity, significance
-            'accept_rate': (variant_df['paper_decision'].str.contains('Accept', case=False).sum() / len(variant_df) * 100),
-            'reject_rate': (variant_df['paper_decision'].str.contains('Reject', case=False).sum() / len(variant_df) * 100)
-        }
-
-        variant_stats.append(stats)
-
-        print(f"\n{variant}:")
+    ctx = ctx or build_analysis_context(df)
+    if ctx.summary:
+        variant_stats = ctx.summary['variant_stats']
+    else:
+        # One hash-grouped pass for every per-variant column
+        # 移除originality, quality, clarity, significance
+        grouped = ctx.variant_gb.agg(
+            count=('avg_rating', 'size'),
+            avg_rating_mean=('avg_rating', 'mean'),
+            avg_rating_std=('avg_rating', 'std'),
+            accept_rate=('is_accept', 'mean'),
+            reject_rate=('is_reject', 'mean'),
+        )
+        grouped[['accept_rate', 'reject_rate']] *= 100
+        variant_stats = grouped.reset_index().to_dict('records')
+
+    for stats in variant_stats:
+        print(f"\n{stats['variant_type']}:")
         print(f"  Count: {stats['count']}")
         print(f"  Avg Rating: {stats['avg_rating_mean']:.2f} ± {stats['avg_rating_std']:.2f}")
         print(f"  Accept Rate: {stats['accept_rate']:.1f}%")
@@ -180,14 +400,13 @@ def analyze_by_variant(df: pd.DataFrame, output_path: Path):
     variant_df_stats = pd.DataFrame(variant_stats)
     variant_df_stats = variant_df_stats.sort_values('avg_rating_mean', ascending=False)
 
-    csv_file = output_path / 'variant_statistics.csv'
-    variant_df_stats.to_csv(csv_file, index=False)
-    print(f"\n[INFO] Saved variant statistics to {csv_file}")
+    table_file = save_table(variant_df_stats, output_path, 'variant_statistics', as_csv)
+    print(f"\n[INFO] Saved variant statistics to {table_file}")
 
     return variant_df_stats
 
 
-def analyze_by_rating_range(df: pd.DataFrame, output_path: Path):
+def analyze_by_rating_range(df: pd.DataFrame, output_path: Path, ctx: AnalysisContext = None):
     """Analyze papers grouped by rating ranges"""
     print("\n" + "="*70)
     print("ANALYSIS BY RATING RANGE")
@@ -196,21 +415,27 @@ def analyze_by_rating_range(df: pd.DataFrame, output_path: Path):
     # Create rating bins
     df['rating_bin'] = pd.cut(df['avg_rating'], bins=RATING_BINS, labels=RATING_LABELS, include_lowest=True)
 
+    if ctx and ctx.summary:
+        rating_ranges = ctx.summary['rating_ranges']
+    else:
+        # One grouped sweep over (range, variant) pairs instead of a filter per range
+        pair_counts = df.groupby(['rating_bin', 'variant_type'], observed=True, sort=False, dropna=False).size()
+        rating_ranges = _rating_range_summary(
+            (label, variant, count) for (label, variant), count in pair_counts.items())
+
     rating_stats = []
 
     for rating_label in RATING_LABELS:
-        rating_df = df[df['rating_bin'] == rating_label]
-
-        if len(rating_df) == 0:
+        if rating_label not in rating_ranges:
             continue
-
+        count = rating_ranges[rating_label]['count']
         # Count variants in this rating range
-        variant_dist = rating_df['variant_type'].value_counts().to_dict()
+        variant_dist = rating_ranges[rating_label]['variant_distribution']
 
         stats = {
             'rating_range': rating_label,
-            'count': len(rating_df),
-            'percentage': (len(rating_df) / len(df)) * 100,
+            'count': count,
+            'percentage': (count / len(df)) * 100,
             # 移除avg_originality, avg_quality, avg_clarity, avg_significance
             'top_variant': max(variant_dist.items(), key=lambda x: x[1])[0] if variant_dist else 'N/A',
             'variant_distribution': variant_dist
@@ -224,40 +449,56 @@ def analyze_by_rating_range(df: pd.DataFrame, output_path: Path):
 
     # Save
     stats_file = output_path / 'rating_range_statistics.json'
-    with open(stats_file, 'w', encoding='utf-8') as f:
-        json.dump(rating_stats, f, indent=2, ensure_ascii=False)
+    dump_json(rating_stats, stats_file)
     print(f"\n[INFO] Saved rating range statistics to {stats_file}")
 
     return rating_stats
 
 
-def compare_original_vs_variants(df: pd.DataFrame, output_path: Path):
+def compare_original_vs_variants(df: pd.DataFrame, output_path: Path, ctx: AnalysisContext = None):
     """Compare original papers vs all variants"""
     print("\n" + "="*70)
     print("ORIGINAL VS VARIANTS COMPARISON")
     print("="*70)
 
-    original_df = df[df['variant_type'] == 'original']
-    variants_df = df[df['variant_type'] != 'original']
+    ctx = ctx or build_analysis_context(df)
+    is_original = (df['variant_type'] == 'original').to_numpy()
+    is_accept = ctx.is_accept.to_numpy()
+    ratings = df['avg_rating'].to_numpy(dtype=np.float64)
+    groups = {}
+    for name, mask in (('original', is_original), ('variants', ~is_original)):
+        group_ratings = ratings[mask]
+        valid = group_ratings[~np.isnan(group_ratings)]
+        groups[name] = {
+            'count': len(group_ratings),
+            'nobs': len(valid),
+            'mean': valid.mean() if len(valid) else np.nan,
+            'std': valid.std(ddof=1) if len(valid) > 1 else np.nan,
+            'accepted': int(is_accept[mask].sum()),
+        }
+    original, variants = groups['original'], groups['variants']
 
     comparison = {
         'original': {
-            'count': len(original_df),
-            'avg_rating': original_df['avg_rating'].mean(),
-            'rating_std': original_df['avg_rating'].std(),
-            'accept_rate': (original_df['paper_decision'].str.contains('Accept', case=False).sum() / len(original_df) * 100) if len(original_df) > 0 else 0,
+            'count': original['count'],
+            'avg_rating': original['mean'],
+            'rating_std': original['std'],
+            'accept_rate': (original['accepted'] / original['count'] * 100) if original['count'] > 0 else 0,
         },
         'variants': {
-            'count': len(variants_df),
-            'avg_rating': variants_df['avg_rating'].mean() if len(variants_df) > 0 else 0,
-            'rating_std': variants_df['avg_rating'].std() if len(variants_df) > 0 else 0,
-            'accept_rate': (variants_df['paper_decision'].str.contains('Accept', case=False).sum() / len(variants_df) * 100) if len(variants_df) > 0 else 0,
+            'count': variants['count'],
+            'avg_rating': variants['mean'] if variants['count'] > 0 else 0,
+            'rating_std': variants['std'] if variants['count'] > 0 else 0,
+            'accept_rate': (variants['accepted'] / variants['count'] * 100) if variants['count'] > 0 else 0,
         }
     }
 
-    # Statistical test
-    if len(original_df) > 0 and len(variants_df) > 0:
-        t_stat, p_value = stats.ttest_ind(original_df['avg_rating'], variants_df['avg_rating'])
+    # Statistical test (Welch's t-test from the group summaries; no second pass over the ratings)
+    if original['count'] > 0 and variants['count'] > 0:
+        t_stat, p_value = stats.ttest_ind_from_stats(
+            mean1=original['mean'], std1=original['std'], nobs1=original['nobs'],
+            mean2=variants['mean'], std2=variants['std'], nobs2=variants['nobs'],
+            equal_var=False)
         # 转换numpy.bool_为Python bool
         significant = bool(p_value < 0.05)
         comparison['statistical_test'] = {
@@ -281,26 +522,24 @@ def compare_original_vs_variants(df: pd.DataFrame, output_path: Path):
 
     # Save
     comp_file = output_path / 'original_vs_variants.json'
-    with open(comp_file, 'w', encoding='utf-8') as f:
-        json.dump(comparison, f, indent=2, ensure_ascii=False)
+    dump_json(comparison, comp_file)
     print(f"\n[INFO] Saved comparison to {comp_file}")
 
     return comparison
 
 
-def create_visualizations(df: pd.DataFrame, output_path: Path):
-    """Create visualization plots"""
-    print("\n" + "="*70)
-    print("GENERATING VISUALIZATIONS")
-    print("="*70)
-
-    # Set style
+def _apply_plot_style():
     sns.set_style("whitegrid")
     plt.rcParams['figure.figsize'] = (12, 8)
 
-    # 1. Rating distribution histogram
+
+def plot_rating_distribution(df: pd.DataFrame, output_path: Path, variant_order) -> str:
+    """1. Rating distribution histogram"""
     plt.figure(figsize=(10, 6))
-    plt.hist(df['avg_rating'], bins=20, edgecolor='black', alpha=0.7)
+    # Bin once in numpy and draw the bars directly
+    counts, edges = np.histogram(df['avg_rating'].dropna().to_numpy(), bins=20)
+    widths = np.diff(edges)
+    plt.bar(edges[:-1] + widths / 2, counts, width=widths, edgecolor='black', alpha=0.7)
     plt.xlabel('Average Rating', fontsize=12)
     plt.ylabel('Number of Papers', fontsize=12)
     plt.title('Distribution of Paper Ratings', fontsize=14, fontweight='bold')
@@ -308,34 +547,72 @@ def create_visualizations(df: pd.DataFrame, output_path: Path):
     plt.axvline(df['avg_rating'].median(), color='green', linestyle='--', label=f'Median: {df["avg_rating"].median():.2f}')
     plt.legend()
     plt.tight_layout()
-    plt.savefig(output_path / 'rating_distribution.png', dpi=300)
-    print(f"[INFO] Saved rating_distribution.png")
+    plt.savefig(output_path / 'rating_distribution.png', **SAVEFIG_KWARGS)
     plt.close()
-
-    # 2. Ratings by variant type (box plot)
+    return 'rating_distribution.png'
+
+
+def variant_box_stats(df: pd.DataFrame, variant_order, whis: float = 1.5) -> list:
+    """Per-variant Tukey box summaries for Axes.bxp, from one grouped quantile pass
+
+    Same definition as matplotlib's boxplot_stats (linear quartiles, whiskers at the
+    most extreme ratings within whis * IQR, everything beyond is a flier).
+    """
+    valid = df['avg_rating'].notna()
+    rating = df.loc[valid, 'avg_rating']
+    variant = df.loc[valid, 'variant_type']
+    quartiles = rating.groupby(variant, sort=False).quantile([0.25, 0.5, 0.75]).unstack()
+    iqr = quartiles[0.75] - quartiles[0.25]
+    low_fence = variant.map(quartiles[0.25] - whis * iqr)
+    high_fence = variant.map(quartiles[0.75] + whis * iqr)
+    inside = (rating >= low_fence) & (rating <= high_fence)
+    whisker_low = rating[inside].groupby(variant[inside], sort=False).min()
+    whisker_high = rating[inside].groupby(variant[inside], sort=False).max()
+    fliers = rating[~inside].groupby(variant[~inside], sort=False).agg(list)
+
+    return [{
+        'label': v,
+        'q1': quartiles.at[v, 0.25],
+        'med': quartiles.at[v, 0.5],
+        'q3': quartiles.at[v, 0.75],
+        'whislo': whisker_low[v],
+        'whishi': whisker_high[v],
+        'fliers': fliers.get(v, []),
+    } for v in variant_order if v in quartiles.index]
+
+
+def plot_ratings_by_variant_boxplot(df: pd.DataFrame, output_path: Path, variant_order) -> str:
+    """2. Ratings by variant type (box plot)"""
+    box_stats = variant_box_stats(df, variant_order)
     plt.figure(figsize=(14, 8))
-    variant_order = df.groupby('variant_type')['avg_rating'].mean().sort_values(ascending=False).index
-    sns.boxplot(data=df, x='variant_type', y='avg_rating', order=variant_order)
+    ax = plt.gca()
+    # Pre-aggregated boxes: no per-variant quantile work inside the plotting call
+    ax.bxp(box_stats, positions=range(len(box_stats)), widths=0.8, patch_artist=True,
+           boxprops={'facecolor': 'C0', 'alpha': 0.8}, medianprops={'color': 'black'})
     plt.xlabel('Variant Type', fontsize=12)
     plt.ylabel('Average Rating', fontsize=12)
     plt.title('Rating Distribution by Variant Type', fontsize=14, fontweight='bold')
     plt.xticks(rotation=45, ha='right')
     plt.tight_layout()
-    plt.savefig(output_path / 'ratings_by_variant_boxplot.png', dpi=300)
-    print(f"[INFO] Saved ratings_by_variant_boxplot.png")
+    plt.savefig(output_path / 'ratings_by_variant_boxplot.png', **SAVEFIG_KWARGS)
     plt.close()
+    return 'ratings_by_variant_boxplot.png'
 
-    # 3. Decision distribution pie chart
+
+def plot_decision_distribution(df: pd.DataFrame, output_path: Path, variant_order) -> str:
+    """3. Decision distribution pie chart"""
     plt.figure(figsize=(10, 10))
     decision_counts = df['paper_decision'].value_counts()
     plt.pie(decision_counts.values, labels=decision_counts.index, autopct='%1.1f%%', startangle=90)
     plt.title('Paper Decision Distribution', fontsize=14, fontweight='bold')
     plt.tight_layout()
-    plt.savefig(output_path / 'decision_distribution.png', dpi=300)
-    print(f"[INFO] Saved decision_distribution.png")
+    plt.savefig(output_path / 'decision_distribution.png', **SAVEFIG_KWARGS)
     plt.close()
+    return 'decision_distribution.png'
+
 
-    # 4. Aspect ratings comparison (radar chart-like)
+def plot_aspect_ratings(df: pd.DataFrame, output_path: Path, variant_order) -> str:
+    """4. Aspect ratings comparison (radar chart-like)"""
     aspects = ['originality', 'quality', 'clarity', 'significance']
     aspect_means = [df[aspect].mean() for aspect in aspects]
 
@@ -348,63 +625,192 @@ def create_visualizations(df: pd.DataFrame, output_path: Path):
     for i, v in enumerate(aspect_means):
         plt.text(i, v + 0.2, f'{v:.2f}', ha='center', fontweight='bold')
     plt.tight_layout()
-    plt.savefig(output_path / 'aspect_ratings.png', dpi=300)
-    print(f"[INFO] Saved aspect_ratings.png")
+    plt.savefig(output_path / 'aspect_ratings.png', **SAVEFIG_KWARGS)
     plt.close()
+    return 'aspect_ratings.png'
 
-    # 5. Heatmap: Variant vs Decision
+
+def plot_variant_decision_heatmap(df: pd.DataFrame, output_path: Path, variant_order) -> str:
+    """5. Heatmap: Variant vs Decision"""
     variant_decision = pd.crosstab(df['variant_type'], df['paper_decision'])
+    variant_decision = variant_decision[sorted(variant_decision.columns)]  # categorical order is first-seen
     plt.figure(figsize=(12, 8))
     sns.heatmap(variant_decision, annot=True, fmt='d', cmap='YlOrRd')
     plt.title('Variant Type vs Decision Heatmap', fontsize=14, fontweight='bold')
     plt.xlabel('Decision', fontsize=12)
     plt.ylabel('Variant Type', fontsize=12)
     plt.tight_layout()
-    plt.savefig(output_path / 'variant_decision_heatmap.png', dpi=300)
-    print(f"[INFO] Saved variant_decision_heatmap.png")
+    plt.savefig(output_path / 'variant_decision_heatmap.png', **SAVEFIG_KWARGS)
     plt.close()
-
-    # 6. Correlation heatmap of aspect ratings
+    return 'variant_decision_heatmap.png'
+
+
+if HAS_NUMBA:
+    @njit(parallel=True, cache=True)
+    def _pairwise_corr_numba(a):
+        """Pearson correlation over pairwise-complete rows, like DataFrame.corr(); one column pair per task"""
+        n, k = a.shape
+        out = np.empty((k, k))
+        for i in prange(k):
+            for j in range(i, k):
+                count = 0
+                sum_x = 0.0
+                sum_y = 0.0
+                for r in range(n):
+                    x = a[r, i]
+                    y = a[r, j]
+                    if not (np.isnan(x) or np.isnan(y)):
+                        count += 1
+                        sum_x += x
+                        sum_y += y
+                value = np.nan
+                if count > 0:
+                    mean_x = sum_x / count
+                    mean_y = sum_y / count
+                    sxx = 0.0
+                    syy = 0.0
+                    sxy = 0.0
+                    for r in range(n):
+                        x = a[r, i]
+                        y = a[r, j]
+                        if not (np.isnan(x) or np.isnan(y)):
+                            dx = x - mean_x
+                            dy = y - mean_y
+                            sxx += dx * dx
+                            syy += dy * dy
+                            sxy += dx * dy
+                    divisor = np.sqrt(sxx * syy)
+                    if divisor != 0.0:
+                        value = sxy / divisor
+                out[i, j] = value
+                out[j, i] = value
+        return out
+
+
+def correlation_matrix(df: pd.DataFrame, columns) -> pd.DataFrame:
+    """Pairwise Pearson correlations of columns (NaNs dropped per pair)"""
+    if HAS_NUMBA and len(df) >= NUMBA_CORR_MIN_ROWS:
+        corr = _pairwise_corr_numba(df[columns].to_numpy(dtype=np.float64))
+        return pd.DataFrame(corr, index=columns, columns=columns)
+    return df[columns].corr()
+
+
+def linear_trend(x: np.ndarray, y: np.ndarray):
+    """Least-squares slope and intercept in closed form (cov / var), over rows where both are finite"""
+    finite = np.isfinite(x) & np.isfinite(y)
+    x = x[finite].astype(np.float64)
+    y = y[finite].astype(np.float64)
+    mean_x = x.mean()
+    mean_y = y.mean()
+    dx = x - mean_x
+    slope = np.dot(dx, y - mean_y) / np.dot(dx, dx)
+    return slope, mean_y - slope * mean_x
+
+
+def plot_correlation_heatmap(df: pd.DataFrame, output_path: Path, variant_order) -> str:
+    """6. Correlation heatmap of aspect ratings"""
     aspect_cols = ['avg_rating', 'originality', 'quality', 'clarity', 'significance', 'confidence']
-    corr_matrix = df[aspect_cols].corr()
+    corr_matrix = correlation_matrix(df, aspect_cols)
 
     plt.figure(figsize=(10, 8))
     sns.heatmap(corr_matrix, annot=True, fmt='.2f', cmap='coolwarm', center=0,
                 square=True, linewidths=1, cbar_kws={"shrink": 0.8})
     plt.title('Correlation Matrix of Evaluation Aspects', fontsize=14, fontweight='bold')
     plt.tight_layout()
-    plt.savefig(output_path / 'correlation_heatmap.png', dpi=300)
-    print(f"[INFO] Saved correlation_heatmap.png")
+    plt.savefig(output_path / 'correlation_heatmap.png', **SAVEFIG_KWARGS)
     plt.close()
+    return 'correlation_heatmap.png'
 
-    # 7. Rating by variant (violin plot)
+
+def plot_ratings_by_variant_violin(df: pd.DataFrame, output_path: Path, variant_order) -> str:
+    """7. Rating by variant (violin plot)"""
+    ratings = dict(tuple(df['avg_rating'].dropna().groupby(df['variant_type'], sort=False)))
+    labels = [v for v in variant_order if v in ratings]
     plt.figure(figsize=(14, 8))
-    sns.violinplot(data=df, x='variant_type', y='avg_rating', order=variant_order)
+    # matplotlib's violinplot on pre-split arrays: one KDE per variant, no seaborn re-grouping
+    plt.violinplot([ratings[v].to_numpy() for v in labels], positions=range(len(labels)),
+                   widths=0.8, showmedians=True)
+    plt.xticks(range(len(labels)), labels)
     plt.xlabel('Variant Type', fontsize=12)
     plt.ylabel('Average Rating', fontsize=12)
     plt.title('Rating Distribution by Variant Type (Violin Plot)', fontsize=14, fontweight='bold')
     plt.xticks(rotation=45, ha='right')
     plt.tight_layout()
-    plt.savefig(output_path / 'ratings_by_variant_violin.png', dpi=300)
-    print(f"[INFO] Saved ratings_by_variant_violin.png")
+    plt.savefig(output_path / 'ratings_by_variant_violin.png', **SAVEFIG_KWARGS)
     plt.close()
+    return 'ratings_by_variant_violin.png'
+
+
+def plot_text_length_vs_rating(df: pd.DataFrame, output_path: Path, variant_order) -> str:
+    """8. Text length vs rating scatter"""
+    text_length = df['text_length'].to_numpy()
+    rating = df['avg_rating'].to_numpy()
+    # Large runs: the trend is fitted on every paper but only a fixed random sample is drawn
+    if len(df) > SCATTER_MAX_POINTS:
+        idx = np.random.default_rng(0).choice(len(df), SCATTER_MAX_POINTS, replace=False)
+        x, y = text_length[idx], rating[idx]
+    else:
+        x, y = text_length, rating
 
-    # 8. Text length vs rating scatter
     plt.figure(figsize=(10, 6))
-    plt.scatter(df['text_length'], df['avg_rating'], alpha=0.5)
+    plt.scatter(x, y, alpha=0.5)
     plt.xlabel('Text Length (characters)', fontsize=12)
     plt.ylabel('Average Rating', fontsize=12)
     plt.title('Text Length vs Average Rating', fontsize=14, fontweight='bold')
 
     # Add trend line
-    z = np.polyfit(df['text_length'], df['avg_rating'], 1)
-    p = np.poly1d(z)
-    plt.plot(df['text_length'], p(df['text_length']), "r--", alpha=0.8, label=f'Trend: y={z[0]:.2e}x+{z[1]:.2f}')
+    slope, intercept = linear_trend(text_length, rating)
+    plt.plot(x, slope * x + intercept, "r--", alpha=0.8, label=f'Trend: y={slope:.2e}x+{intercept:.2f}')
     plt.legend()
     plt.tight_layout()
-    plt.savefig(output_path / 'text_length_vs_rating.png', dpi=300)
-    print(f"[INFO] Saved text_length_vs_rating.png")
+    plt.savefig(output_path / 'text_length_vs_rating.png', **SAVEFIG_KWARGS)
     plt.close()
+    return 'text_length_vs_rating.png'
+
+
+PLOT_FUNCTIONS = (
+    plot_rating_distribution,
+    plot_ratings_by_variant_boxplot,
+    plot_decision_distribution,
+    plot_aspect_ratings,
+    plot_variant_decision_heatmap,
+    plot_correlation_heatmap,
+    plot_ratings_by_variant_violin,
+    plot_text_length_vs_rating,
+)
+# Columns the plots read; only these are shipped to worker processes
+PLOT_COLUMNS = ['variant_type', 'paper_decision', 'avg_rating', 'text_length', 'confidence',
+                'originality', 'quality', 'clarity', 'significance']
+
+
+def _run_plot_task(fn, df, output_path, variant_order):
+    """Process-pool worker: style is applied per process so spawn-based pools match"""
+    _apply_plot_style()
+    return fn(df, output_path, variant_order)
+
+
+def create_visualizations(df: pd.DataFrame, output_path: Path, ctx: AnalysisContext = None,
+                          workers: Optional[int] = None):
+    """Create visualization plots, rendered in worker processes when more than one worker is used"""
+    print("\n" + "="*70)
+    print("GENERATING VISUALIZATIONS")
+    print("="*70)
+
+    ctx = ctx or build_analysis_context(df)
+    variant_order = ctx.variant_gb['avg_rating'].mean().sort_values(ascending=False).index
+    plot_df = df[PLOT_COLUMNS]
+
+    if workers is None:
+        workers = min(8, os.cpu_count() or 1, len(PLOT_FUNCTIONS))
+    if workers <= 1:
+        for fn in PLOT_FUNCTIONS:
+            print(f"[INFO] Saved {_run_plot_task(fn, plot_df, output_path, variant_order)}")
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            futures = [ex.submit(_run_plot_task, fn, plot_df, output_path, variant_order)
+                       for fn in PLOT_FUNCTIONS]
+            for future in futures:
+                print(f"[INFO] Saved {future.result()}")
 
     print(f"\n[INFO] All visualizations saved to {output_path}")
 
@@ -413,64 +819,59 @@ def generate_detailed_report(df: pd.DataFrame, output_path: Path,
                             overall_stats: dict, variant_stats: pd.DataFrame):
     """Generate a detailed text report"""
     report_file = output_path / 'analysis_report.txt'
+    parts = []
+
+    parts.append("="*70 + "\n")
+    parts.append("PAPER EVALUATION ANALYSIS REPORT\n")
+    parts.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+    parts.append("="*70 + "\n\n")
+
+    # Overall statistics
+    parts.append("OVERALL STATISTICS\n")
+    parts.append("-"*70 + "\n")
+    parts.append(f"Total Papers Evaluated: {overall_stats['total_papers']}\n\n")
+
+    parts.append("Rating Statistics:\n")
+    for key, value in overall_stats['rating_statistics'].items():
+        parts.append(f"  {key.capitalize()}: {value:.2f}\n")
+
+    # 移除Aspect Ratings (Average)
 
-    with open(report_file, 'w', encoding='utf-8') as f:
-        f.write("="*70 + "\n")
-        f.write("PAPER EVALUATION ANALYSIS REPORT\n")
-        f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-        f.write("="*70 + "\n\n")
-
-        # Overall statistics
-        f.write("OVERALL STATISTICS\n")
-        f.write("-"*70 + "\n")
-        f.write(f"Total Papers Evaluated: {overall_stats['total_papers']}\n\n")
-
-        f.write("Rating Statistics:\n")
-        for key, value in overall_stats['rating_statistics'].items():
-            f.write(f"  {key.capitalize()}: {value:.2f}\n")
-
-        # 移除Aspect Ratings (Average)
-
-        f.write("\nDecision Distribution:\n")
-        for decision, count in overall_stats['decision_distribution'].items():
-            pct = (count / overall_stats['total_papers']) * 100
-            f.write(f"  {decision}: {count} ({pct:.1f}%)\n")
-
-        # Variant analysis
-        f.write("\n\n" + "="*70 + "\n")
-        f.write("VARIANT TYPE ANALYSIS\n")
-        f.write("="*70 + "\n\n")
-
-        for _, row in variant_stats.iterrows():
-            f.write(f"{row['variant_type']}:\n")
-            f.write(f"  Count: {row['count']}\n")
-            f.write(f"  Average Rating: {row['avg_rating_mean']:.2f} ± {row['avg_rating_std']:.2f}\n")
-            f.write(f"  Accept Rate: {row['accept_rate']:.1f}%\n")
-            f.write(f"  Reject Rate: {row['reject_rate']:.1f}%\n\n")
-
-        # Top and bottom rated papers
-        f.write("\n" + "="*70 + "\n")
-        f.write("TOP 10 RATED PAPERS\n")
-        f.write("="*70 + "\n\n")
-
-        top_papers = df.nlargest(10, 'avg_rating')
-        for i, (_, paper) in enumerate(top_papers.iterrows(), 1):
-            f.write(f"{i}. {paper['title'][:60]}...\n")
-            f.write(f"   Variant: {paper['variant_type']}, Rating: {paper['avg_rating']:.2f}\n\n")
-
-        f.write("\n" + "="*70 + "\n")
-        f.write("BOTTOM 10 RATED PAPERS\n")
-        f.write("="*70 + "\n\n")
-
-        bottom_papers = df.nsmallest(10, 'avg_rating')
-        for i, (_, paper) in enumerate(bottom_papers.iterrows(), 1):
-            f.write(f"{i}. {paper['title'][:60]}...\n")
-            f.write(f"   Variant: {paper['variant_type']}, Rating: {paper['avg_rating']:.2f}\n\n")
+    parts.append("\nDecision Distribution:\n")
+    for decision, count in overall_stats['decision_distribution'].items():
+        pct = (count / overall_stats['total_papers']) * 100
+        parts.append(f"  {decision}: {count} ({pct:.1f}%)\n")
+
+    # Variant analysis
+    parts.append("\n\n" + "="*70 + "\n")
+    parts.append("VARIANT TYPE ANALYSIS\n")
+    parts.append("="*70 + "\n\n")
+
+    for row in variant_stats.itertuples(index=False):
+        parts.append(f"{row.variant_type}:\n")
+        parts.append(f"  Count: {row.count}\n")
+        parts.append(f"  Average Rating: {row.avg_rating_mean:.2f} ± {row.avg_rating_std:.2f}\n")
+        parts.append(f"  Accept Rate: {row.accept_rate:.1f}%\n")
+        parts.append(f"  Reject Rate: {row.reject_rate:.1f}%\n\n")
+
+    # Top and bottom rated papers (plain arrays instead of per-row pandas accessors)
+    paper_columns = ['title', 'variant_type', 'avg_rating']
+    for heading, papers in (("TOP 10 RATED PAPERS", df.nlargest(10, 'avg_rating')),
+                            ("BOTTOM 10 RATED PAPERS", df.nsmallest(10, 'avg_rating'))):
+        parts.append("\n" + "="*70 + "\n")
+        parts.append(f"{heading}\n")
+        parts.append("="*70 + "\n\n")
+
+        for i, (title, variant, rating) in enumerate(papers[paper_columns].to_numpy(), 1):
+            parts.append(f"{i}. {title[:60]}...\n")
+            parts.append(f"   Variant: {variant}, Rating: {rating:.2f}\n\n")
+
+    report_file.write_text(''.join(parts), encoding='utf-8')
 
     print(f"\n[INFO] Saved detailed report to {report_file}")
 
 
-def main():
+def main(workers: Optional[int] = None, as_csv: bool = False):
     print("="*70)
     print("Paper Evaluation Analysis Script")
     print("="*70)
@@ -483,22 +884,22 @@ def main():
     output_path = create_output_dir(OUTPUT_DIR)
     print(f"[INFO] Output directory: {output_path}")
 
-    # Run analyses
-    overall_stats = analyze_overall_statistics(df, output_path)
-    variant_stats = analyze_by_variant(df, output_path)
-    rating_stats = analyze_by_rating_range(df, output_path)
-    comparison = compare_original_vs_variants(df, output_path)
+    # Run analyses (all summary aggregates in one polars collect when available)
+    ctx = build_analysis_context(df, summarize_with_polars(df) if HAS_POLARS else None)
+    overall_stats = analyze_overall_statistics(df, output_path, ctx)
+    variant_stats = analyze_by_variant(df, output_path, ctx, as_csv)
+    rating_stats = analyze_by_rating_range(df, output_path, ctx)
+    comparison = compare_original_vs_variants(df, output_path, ctx)
 
     # Create visualizations
-    create_visualizations(df, output_path)
+    create_visualizations(df, output_path, ctx, workers)
 
     # Generate report
     generate_detailed_report(df, output_path, overall_stats, variant_stats)
 
     # Save processed DataFrame
-    csv_output = output_path / 'processed_data.csv'
-    df.to_csv(csv_output, index=False)
-    print(f"\n[INFO] Saved processed data to {csv_output}")
+    table_output = save_table(df, output_path, 'processed_data', as_csv)
+    print(f"\n[INFO] Saved processed data to {table_output}")
 
     print("\n" + "="*70)
     print("Analysis Complete!")
@@ -508,5 +909,11 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Analyze and visualize paper evaluation results")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Processes used to render plots (default: min(8, CPU count); 1 keeps everything in-process)")
+    parser.add_argument("--csv", action="store_true",
+                        help="Write variant_statistics and processed_data as CSV instead of Parquet")
+    args = parser.parse_args()
+    main(workers=args.workers, as_csv=args.csv)
 
@@ -1,14 +1,76 @@
 import json
 import re
+from itertools import islice
+
+# orjson parses the raw line bytes in C (no text-mode decode pass)
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+# hyperscan matches all section patterns in one linear-time DFA scan (no backtracking)
+try:
+    import hyperscan
+    HAS_HYPERSCAN = True
+except ImportError:
+    HAS_HYPERSCAN = False
+
+# Look for conclusion-related sections with various formats (in priority order)
+SECTION_PATTERNS = [
+    r'[Cc]onclusion[s]?(?:\s+and\s+[Ff]uture\s+[Ww]ork)?',
+    r'[Cc]oncluding\s+[Rr]emarks?',
+    r'[Ss]ummary',
+    r'[Dd]iscussion',
+    r'CONCLUSION[S]?(?:\s+(?:AND|&)\s+FUTURE\s+WORK)?',
+]
+# One pass per paper: each alternative is a named group, so a match tells which pattern hit.
+# The trailing newline is a lookahead so back-to-back headings can share it.
+COMBINED_SECTION_RE = re.compile(
+    r'\n\s*(?:\d+\.?\s*)?(?:'
+    + '|'.join(f'(?P<p{i}>{pattern})' for i, pattern in enumerate(SECTION_PATTERNS))
+    + r')(?=\s*\n)'
+)
+NUMBERED_SECTION_RE = re.compile(r'\n\s*(\d+\.?\s+[A-Z][a-zA-Z\s]{3,30})\n')
+
+if HAS_HYPERSCAN:
+    # Only used to find which patterns occur; the headings are then read with Python re.
+    # UTF8 | UCP makes \s and \d Unicode-aware like Python's str patterns; Python's \s also
+    # matches \x1c-\x1f (not Unicode White_Space), so those are added to the class explicitly.
+    def _hs_expression(pattern):
+        expression = r'\n\s*(?:\d+\.?\s*)?(?:' + pattern + r')\s*\n'
+        return expression.replace(r'\s', r'[\s\x1c-\x1f]').encode()
+
+    SECTION_DB = hyperscan.Database()
+    SECTION_DB.compile(
+        expressions=[_hs_expression(pattern) for pattern in SECTION_PATTERNS],
+        ids=list(range(len(SECTION_PATTERNS))),
+        flags=[hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP]
+        * len(SECTION_PATTERNS),
+    )
+    SINGLE_SECTION_RES = [
+        re.compile(r'\n\s*(?:\d+\.?\s*)?(' + pattern + r')(?=\s*\n)') for pattern in SECTION_PATTERNS
+    ]
 
-# Load first few papers and find section patterns
-with open('../train.jsonl', 'r', encoding='utf-8') as f:
-    for i in range(10):  # Check first 10 papers
-        line = f.readline()
-        if not line:
-            break
 
-        obj = json.loads(line)
+def find_conclusion_sections(text):
+    """Headings of the highest-priority section pattern present in text (empty if none)"""
+    if HAS_HYPERSCAN:
+        hits = set()
+        SECTION_DB.scan(text.encode('utf-8'),
+                        match_event_handler=lambda pattern_id, start, end, flags, context: hits.add(pattern_id))
+        return SINGLE_SECTION_RES[min(hits)].findall(text) if hits else []
+
+    matches_by_pattern = [[] for _ in SECTION_PATTERNS]
+    for match in COMBINED_SECTION_RE.finditer(text):
+        matches_by_pattern[int(match.lastgroup[1:])].append(match.group(match.lastgroup))
+    return next((matches for matches in matches_by_pattern if matches), [])
+
+
+# Load first few papers and find section patterns
+with open('../train.jsonl', 'rb') as f:
+    for i, line in enumerate(islice(f, 10)):  # Check first 10 papers
+        obj = json_loads(line)
         text = obj['messages'][1]['content']
         title = obj.get('title', 'Unknown')
 
@@ -16,32 +78,15 @@ with open('../train.jsonl', 'r', encoding='utf-8') as f:
         print(f"Paper {i+1}: {title[:50]}...")
         print('='*60)
 
-        # Look for conclusion-related sections with various formats
-        patterns = [
-            r'\n\s*(\d+\.?\s*)?([Cc]onclusion[s]?(?:\s+and\s+[Ff]uture\s+[Ww]ork)?)\s*\n',
-            r'\n\s*(\d+\.?\s*)?([Cc]oncluding\s+[Rr]emarks?)\s*\n',
-            r'\n\s*(\d+\.?\s*)?([Ss]ummary)\s*\n',
-            r'\n\s*(\d+\.?\s*)?([Dd]iscussion)\s*\n',
-            r'\n\s*(\d+\.?\s*)?(CONCLUSION[S]?(?:\s+(?:AND|&)\s+FUTURE\s+WORK)?)\s*\n',
-        ]
-
-        found_conclusion = False
-        for pattern in patterns:
-            matches = re.findall(pattern, text)
-            if matches:
-                print(f"Found conclusion-like sections:")
-                for match in matches[:3]:  # Show first 3
-                    section = match[1] if len(match) > 1 else match[0]
-                    print(f"  - {section}")
-                found_conclusion = True
-                break
-
-        if not found_conclusion:
+        matches = find_conclusion_sections(text)
+        if matches:
+            print(f"Found conclusion-like sections:")
+            for section in matches[:3]:  # Show first 3
+                print(f"  - {section}")
+        else:
             # Show any numbered section to understand format
-            sections = re.findall(r'\n\s*(\d+\.?\s+[A-Z][a-zA-Z\s]{3,30})\n', text)
+            sections = NUMBERED_SECTION_RE.findall(text)
             if sections:
                 print("Sample numbered sections:")
                 for section in sections[:5]:
                     print(f"  - {section.strip()}")
-
-